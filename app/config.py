@@ -1,8 +1,14 @@
 # AI_Dungeon/app/config.py
 import json
+import mmap
 import os
 from typing import Any, Dict, List
 
+try:
+    import orjson
+except ImportError:  # optional fast parser; stdlib json is the fallback
+    orjson = None
+
 _base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 _config_dir = os.path.join(_base_dir, 'config')
 
@@ -11,65 +17,86 @@ _items: List[Dict[str, Any]] = []
 _wall_types: List[Dict[str, Any]] = []
 _enemy_types: List[Dict[str, Any]] = []
 _map_entities: List[Dict[str, Any]] = []
+# Set by reload_all(); getters load lazily until then
+_initialized = False
+# Bumped on every reload so callers can refresh values derived from the config
+_generation = 0
+
+# Files at least this large are parsed straight from a read-only mapping
+_MMAP_MIN_BYTES = 64 * 1024
+
+
+def _load_mapped(path: str):
+    """Parse a large JSON file with orjson directly from an mmap (no read() copy)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if hasattr(mmap, 'MAP_POPULATE'):
+            # Linux: prefault the pages so the parser never stalls on a page miss
+            mm = mmap.mmap(fd, 0, flags=mmap.MAP_SHARED | mmap.MAP_POPULATE, prot=mmap.PROT_READ)
+        else:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
 
 
 def _load_json(path: str, default):
     try:
+        if orjson is not None and os.path.getsize(path) >= _MMAP_MIN_BYTES:
+            return _load_mapped(path)
+        if orjson is not None:
+            # orjson parses bytes directly, skipping the utf-8 decode pass
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception:
         return default
 
 
-def reload_all() -> None:
-    global _game_config, _items, _wall_types, _enemy_types, _map_entities
-    os.makedirs(_config_dir, exist_ok=True)
-    _game_config = _load_json(os.path.join(_config_dir, 'game_config.json'), {})
-    _items = _load_json(os.path.join(_config_dir, 'items.json'), [])
-    _wall_types = _load_json(os.path.join(_config_dir, 'wall_types.json'), [])
-    _enemy_types = _load_json(os.path.join(_config_dir, 'enemy_types.json'), [])
-    _map_entities = _load_json(os.path.join(_config_dir, 'map_entities.json'), [])
-
-
-def get_game_config() -> Dict[str, Any]:
-    if not _game_config:
-        reload_all()
-        # defaults if missing keys
+def _normalize_game_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in defaults for any keys missing from game_config.json."""
+    if not isinstance(cfg, dict):
+        cfg = {}
     # sensible defaults
-    _game_config.setdefault('seed', None)
-    _game_config.setdefault('initial_attributes_count', 10)
-    _game_config.setdefault('speed', {
+    cfg.setdefault('seed', None)
+    cfg.setdefault('initial_attributes_count', 10)
+    cfg.setdefault('speed', {
         'maxspeedpermove': 1,
         'minspeed': 3,
         'max_speed_stat': 16,
         'min_speed_stat': 1,
     })
-    _game_config.setdefault('spawns', {
+    cfg.setdefault('spawns', {
         'random_items': 0,
         'random_chests': 0,
         'random_enemies': 0,
     })
     # Ensure keys exist if file provided a partial 'spawns'
     try:
-        sp = _game_config.get('spawns') or {}
+        sp = cfg.get('spawns') or {}
         sp.setdefault('random_items', 0)
         sp.setdefault('random_chests', 0)
         sp.setdefault('random_enemies', 0)
-        _game_config['spawns'] = sp
+        cfg['spawns'] = sp
     except Exception:
         pass
-    _game_config.setdefault('biomes', {
+    cfg.setdefault('biomes', {
         'count': 6,
         'radius': 24,
     })
     # Enemy system defaults
-    enemies_cfg = _game_config.get('enemies') or {}
+    enemies_cfg = cfg.get('enemies') or {}
     if not isinstance(enemies_cfg, dict):
         enemies_cfg = {}
     enemies_cfg.setdefault('move', True)
-    _game_config['enemies'] = enemies_cfg
+    cfg['enemies'] = enemies_cfg
     # Visibility/fog-of-war defaults
-    vis = _game_config.get('visibility') or {}
+    vis = cfg.get('visibility') or {}
     if not isinstance(vis, dict):
         vis = {}
     vis.setdefault('mode', 'reveal')  # 'full', 'fog', or 'reveal'
@@ -82,32 +109,61 @@ def get_game_config() -> Dict[str, Any]:
     vis.setdefault('enemy_pings_ignore_visibility', True)  # show pings even on unseen tiles
     # Show chest markers through fog on big map
     vis.setdefault('show_chests', True)
-    _game_config['visibility'] = vis
+    cfg['visibility'] = vis
     # Chest loot tables (optional)
-    _game_config.setdefault('chests', {})
+    cfg.setdefault('chests', {})
+    return cfg
+
+
+def reload_all() -> None:
+    global _game_config, _items, _wall_types, _enemy_types, _map_entities, _initialized, _generation
+    os.makedirs(_config_dir, exist_ok=True)
+    _game_config = _normalize_game_config(_load_json(os.path.join(_config_dir, 'game_config.json'), {}))
+    _items = _load_json(os.path.join(_config_dir, 'items.json'), [])
+    _wall_types = _load_json(os.path.join(_config_dir, 'wall_types.json'), [])
+    _enemy_types = _load_json(os.path.join(_config_dir, 'enemy_types.json'), [])
+    _map_entities = _load_json(os.path.join(_config_dir, 'map_entities.json'), [])
+    _initialized = True
+    _generation += 1
+
+
+def config_generation() -> int:
+    """Counter that changes whenever the config files are reloaded."""
+    if not _initialized:
+        reload_all()
+    return _generation
+
+
+def _slow_first_call() -> Dict[str, Any]:
+    reload_all()
     return _game_config
 
 
+def get_game_config() -> Dict[str, Any]:
+    # Defaults are applied once in reload_all(); steady state is a single flag test
+    return _game_config if _initialized else _slow_first_call()
+
+
 def get_items() -> List[Dict[str, Any]]:
-    if not _items:
+    if not _initialized:
         reload_all()
     return _items
 
 
 def get_wall_types() -> List[Dict[str, Any]]:
-    if not _wall_types:
+    if not _initialized:
         reload_all()
     return _wall_types
 
 
 def get_enemy_types() -> List[Dict[str, Any]]:
-    if not _enemy_types:
+    if not _initialized:
         reload_all()
     return _enemy_types
 
 
 def get_map_entities() -> List[Dict[str, Any]]:
-    if not _map_entities:
+    if not _initialized:
         reload_all()
     return _map_entities
 
@@ -1,8 +1,17 @@
 # AI_Dungeon/app/enemy_ai.py
 from __future__ import annotations
 from typing import Dict, List, Literal, Optional, Tuple, TypedDict
-import math
 import random
+from array import array
+
+import numpy as np
+
+from .config import get_game_config
+
+try:
+    from numba import njit
+except ImportError:  # optional JIT; the NumPy batch kernel is the fallback
+    njit = None
 
 # Intent models
 IntentKind = Literal['move', 'attack', 'idle']
@@ -25,70 +34,253 @@ class IdleIntent(TypedDict):
 Intent = MoveIntent | AttackIntent | IdleIntent
 
 # Enemy instance model expected by AI
-class EnemyInst(TypedDict, total=False):
-    id: str
-    type: str
-    pos: Tuple[int, int]
-    hp: int
-    biome: Optional[int]
-    spawner: Optional[Tuple[int, int]]
-    state: Dict[str, float]
+class Enemy:
+    __slots__ = ('id', 'type', 'type_id', 'pos', 'hp', 'biome', 'spawner', 'roam_cd')
+
+    def __init__(self, id: str, type: str = '', pos: Tuple[int, int] = (0, 0), hp: int = 0,
+                 biome: Optional[int] = None, spawner: Optional[Tuple[int, int]] = None,
+                 roam_cd: float = 0.0) -> None:
+        self.id = id
+        self.type = type
+        # Interned AI implementation id; unknown types fall back to slime
+        self.type_id = _TYPE_IDS.get(type, _SLIME_ID)
+        self.pos = pos
+        self.hp = hp
+        self.biome = biome
+        self.spawner = spawner
+        self.roam_cd = roam_cd
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> 'Enemy':
+        pos = d.get('pos', (0, 0))
+        return cls(d['id'], d.get('type', ''), (int(pos[0]), int(pos[1])), int(d.get('hp', 0) or 0),
+                   d.get('biome'), d.get('spawner'), float((d.get('state') or {}).get('roam_cd', 0.0)))
+
+    def as_dict(self) -> Dict:
+        """Plain-dict form for serialization."""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'pos': self.pos,
+            'hp': self.hp,
+            'biome': self.biome,
+            'spawner': self.spawner,
+            'state': {'roam_cd': self.roam_cd},
+        }
+
+
+# Older name kept for annotations elsewhere
+EnemyInst = Enemy
 
 # World view provided to AI
-class WorldView(TypedDict):
+class WorldView(TypedDict, total=False):
     grid_w: int
     grid_h: int
-    walls: List[List[int]]  # same grid as game.py (0 empty, 1 wall)
-    occupied: Dict[Tuple[int, int], str]  # players only
-    solid_cells: set[Tuple[int, int]]
-    players: Dict[str, Tuple[int, int]]  # sid -> (cx, cy)
+    walls: np.ndarray  # same uint8 grid as game.py (0 empty, 1 wall), indexed [y, x]
+    occupied: Dict[int, str]  # players only; packed (y << 8) | x keys like game.py
+    solid_cells: set[int]  # packed keys
+    players: Dict[str, Tuple[int, int]]  # sid -> (cx, cy); only for sid -> pos lookups
+    # Player positions as parallel arrays (SoA), rebuilt once per tick
+    players_x: array
+    players_y: array
+    player_sids: List[str]
+
+
+def make_world_view(grid_w: int, grid_h: int, walls, occupied: Dict[int, str],
+                    solid_cells: set, players: Dict[str, Tuple[int, int]]) -> WorldView:
+    """Build the per-tick WorldView, packing player positions into int arrays."""
+    return {
+        'grid_w': grid_w,
+        'grid_h': grid_h,
+        'walls': walls,
+        'occupied': occupied,
+        'solid_cells': solid_cells,
+        'players': players,
+        'players_x': array('i', [p[0] for p in players.values()]),
+        'players_y': array('i', [p[1] for p in players.values()]),
+        'player_sids': list(players.keys()),
+    }
+
+
+def _world_players(world: WorldView) -> Tuple[array, array, List[str]]:
+    # Views built by hand may only carry the players dict; pack it on first use
+    if 'players_x' not in world:
+        players = world.get('players') or {}
+        world['players_x'] = array('i', [p[0] for p in players.values()])
+        world['players_y'] = array('i', [p[1] for p in players.values()])
+        world['player_sids'] = list(players.keys())
+    return world['players_x'], world['players_y'], world['player_sids']
+
+
+# Wander table: four steps plus standing still, each picked with equal odds
+_IDLE = (0, 0)
+_WANDER_CHOICES = ((1, 0), (-1, 0), (0, 1), (0, -1), _IDLE)
+_rand = random.random
+
+# Below this many players the plain loop beats NumPy's per-call overhead
+_NUMPY_MIN_PLAYERS = 4
+
+def _players_arrays(world: WorldView) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    xs, ys, sids = _world_players(world)
+    # Zero-copy int32 views over the array('i') buffers
+    return np.frombuffer(xs, dtype=np.int32), np.frombuffer(ys, dtype=np.int32), sids
 
 
-def _nearest_player(pos: Tuple[int, int], players: Dict[str, Tuple[int, int]]) -> Optional[Tuple[str, Tuple[int, int], float]]:
-    if not players:
+def _nearest_player(pos: Tuple[int, int], world: WorldView) -> Optional[Tuple[str, Tuple[int, int], int]]:
+    # Returns (sid, (px, py), squared distance); callers compare against squared ranges
+    players_x, players_y, sids = _world_players(world)
+    n = len(sids)
+    if not n:
         return None
     x, y = pos
-    best = None
+    if n >= _NUMPY_MIN_PLAYERS:
+        xs, ys, sids = _players_arrays(world)
+        dx = xs - x
+        dy = ys - y
+        d2 = dx*dx + dy*dy
+        i = int(d2.argmin())
+        return sids[i], (players_x[i], players_y[i]), int(d2[i])
+    best_i = -1
     best_d2 = 10**9
-    for sid, (px, py) in players.items():
-        dx = px - x
-        dy = py - y
+    for i in range(n):
+        dx = players_x[i] - x
+        dy = players_y[i] - y
         d2 = dx*dx + dy*dy
         if d2 < best_d2:
             best_d2 = d2
-            best = (sid, (px, py), math.sqrt(d2))
-    return best
+            best_i = i
+    return sids[best_i], (players_x[best_i], players_y[best_i]), best_d2
 
 
-def slime_ai(enemy: EnemyInst, world: WorldView) -> Intent:
+def slime_ai(enemy: Enemy, world: WorldView) -> Intent:
     # Simple AI: if player within 8 tiles (euclidean), step towards; else random wander with cooldown
-    pos = enemy.get('pos', (0, 0))
-    state = enemy.setdefault('state', {})
-    roam_cd = state.get('roam_cd', 0.0)
+    pos = enemy.pos
 
-    target_info = _nearest_player(pos, world['players'])
+    target_info = _nearest_player(pos, world)
     if target_info is not None:
-        sid, (tx, ty), dist = target_info
-        if dist <= 1.0:
-            return {'kind': 'attack', 'id': enemy['id'], 'target_id': sid}
-        if dist <= 8.0:
-            dx = 1 if tx > pos[0] else (-1 if tx < pos[0] else 0)
-            dy = 1 if ty > pos[1] else (-1 if ty < pos[1] else 0)
-            # Prefer axis with larger gap to avoid diagonal bias
-            if abs(tx - pos[0]) >= abs(ty - pos[1]):
-                return {'kind': 'move', 'id': enemy['id'], 'dx': dx, 'dy': 0}
+        sid, (tx, ty), d2 = target_info
+        if d2 <= 1:
+            return {'kind': 'attack', 'id': enemy.id, 'target_id': sid}
+        if d2 <= 64:  # 8 tiles
+            x, y = pos
+            adx = tx - x
+            ady = ty - y
+            # Prefer axis with larger gap to avoid diagonal bias; bool subtraction gives the sign
+            if adx*adx >= ady*ady:
+                return {'kind': 'move', 'id': enemy.id, 'dx': (tx > x) - (tx < x), 'dy': 0}
             else:
-                return {'kind': 'move', 'id': enemy['id'], 'dx': 0, 'dy': dy}
+                return {'kind': 'move', 'id': enemy.id, 'dx': 0, 'dy': (ty > y) - (ty < y)}
+
+    return _slime_wander(enemy)
 
+
+def _slime_wander(enemy: Enemy) -> Intent:
     # Wander occasionally
+    roam_cd = enemy.roam_cd
     if roam_cd <= 0:
-        state['roam_cd'] = random.uniform(0.5, 2.0)
-        choice = random.choice([(1,0), (-1,0), (0,1), (0,-1), (0,0)])
-        if choice != (0,0):
-            return {'kind': 'move', 'id': enemy['id'], 'dx': choice[0], 'dy': choice[1]}
+        enemy.roam_cd = 0.5 + _rand() * 1.5
+        choice = _WANDER_CHOICES[int(_rand() * 5)]
+        if choice is not _IDLE:
+            return {'kind': 'move', 'id': enemy.id, 'dx': choice[0], 'dy': choice[1]}
     else:
-        state['roam_cd'] = max(0.0, roam_cd - 0.1)  # caller should call at ~10 fps for this to feel okay
-    return {'kind': 'idle', 'id': enemy['id']}
+        enemy.roam_cd = max(0.0, roam_cd - 0.1)  # caller should call at ~10 fps for this to feel okay
+    return {'kind': 'idle', 'id': enemy.id}
+
+
+# Batch kernel outputs: what each slime does this tick
+_K_WANDER = 0
+_K_ATTACK = 1
+_K_MOVE = 2
+
+
+def _slime_batch_np(ex, ey, px, py, out_kind, out_dx, out_dy, out_target) -> None:
+    # One E x P broadcast for nearest player, then masks for attack/move/wander
+    n = ex.shape[0]
+    dx = px[None, :] - ex[:, None]
+    dy = py[None, :] - ey[:, None]
+    d2 = dx*dx + dy*dy
+    idx = d2.argmin(axis=1)
+    rows = np.arange(n)
+    gx = dx[rows, idx]
+    gy = dy[rows, idx]
+    best = d2[rows, idx]
+    # Prefer axis with larger gap to avoid diagonal bias
+    use_x = np.abs(gx) >= np.abs(gy)
+    out_kind[:] = np.where(best <= 1, _K_ATTACK, np.where(best <= 64, _K_MOVE, _K_WANDER))
+    out_dx[:] = np.where(use_x, np.sign(gx), 0)
+    out_dy[:] = np.where(use_x, 0, np.sign(gy))
+    out_target[:] = idx
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _slime_batch(ex, ey, px, py, out_kind, out_dx, out_dy, out_target):
+        n = ex.shape[0]
+        m = px.shape[0]
+        for k in range(n):
+            x = ex[k]
+            y = ey[k]
+            best_i = 0
+            best_d2 = 1 << 30
+            for i in range(m):
+                dx = px[i] - x
+                dy = py[i] - y
+                d2 = dx*dx + dy*dy
+                if d2 < best_d2:
+                    best_d2 = d2
+                    best_i = i
+            out_target[k] = best_i
+            adx = px[best_i] - x
+            ady = py[best_i] - y
+            if best_d2 <= 1:
+                out_kind[k] = 1
+            elif best_d2 <= 64:
+                out_kind[k] = 2
+            else:
+                out_kind[k] = 0
+            if adx*adx >= ady*ady:
+                out_dx[k] = 1 if adx > 0 else (-1 if adx < 0 else 0)
+                out_dy[k] = 0
+            else:
+                out_dx[k] = 0
+                out_dy[k] = 1 if ady > 0 else (-1 if ady < 0 else 0)
+else:
+    _slime_batch = _slime_batch_np
+
+
+def _slime_intents_batch(slimes: List[Enemy], world: WorldView) -> List[Intent]:
+    """slime_ai for a whole list of enemies at once.
+
+    Nearest-player search and step directions run in _slime_batch (Numba when
+    installed, NumPy otherwise); only building the intent dicts and wandering
+    stay per enemy.
+    """
+    n = len(slimes)
+    px, py, sids = _players_arrays(world)
+    if not sids:
+        return [_slime_wander(enemy) for enemy in slimes]
+    ex = np.fromiter((e.pos[0] for e in slimes), dtype=np.int32, count=n)
+    ey = np.fromiter((e.pos[1] for e in slimes), dtype=np.int32, count=n)
+    out_kind = np.empty(n, dtype=np.int8)
+    out_dx = np.empty(n, dtype=np.int8)
+    out_dy = np.empty(n, dtype=np.int8)
+    out_target = np.empty(n, dtype=np.int32)
+    _slime_batch(ex, ey, px, py, out_kind, out_dx, out_dy, out_target)
+    kinds = out_kind.tolist()
+    dxs = out_dx.tolist()
+    dys = out_dy.tolist()
+    targets = out_target.tolist()
+    out: List[Intent] = []
+    out_append = out.append
+    for k, enemy in enumerate(slimes):
+        kind = kinds[k]
+        if kind == _K_ATTACK:
+            out_append({'kind': 'attack', 'id': enemy.id, 'target_id': sids[targets[k]]})
+        elif kind == _K_MOVE:
+            out_append({'kind': 'move', 'id': enemy.id, 'dx': dxs[k], 'dy': dys[k]})
+        else:
+            out_append(_slime_wander(enemy))
+    return out
 
 
 AI_DISPATCH = {
@@ -111,52 +303,70 @@ AI_DISPATCH = {
 }
 
 
-def compute_enemy_intents(world: WorldView, enemies: Dict[str, EnemyInst]) -> List[Intent]:
-    intents: List[Intent] = []
-    for eid, enemy in enemies.items():
-        t = enemy.get('type', '')
-        fn = AI_DISPATCH.get(t, slime_ai)
-        try:
-            intent = fn(enemy, world)
-        except Exception:
-            intent = {'kind': 'idle', 'id': enemy['id']}
-        intents.append(intent)
+def compute_enemy_intents(world: WorldView, enemies: Dict[str, Enemy]) -> List[Intent]:
+    # Movement disabled in config: nothing can move or wander, everyone idles
+    if not get_game_config()['enemies']['move']:
+        return [{'kind': 'idle', 'id': e.id} for e in enemies.values()]
+    intents: List[Intent] = [None] * len(enemies)
+    # Bind per-tick lookups once; this runs for every enemy at ~10 fps
+    ai_by_id = _AI_BY_ID
+    # Slimes are collected and evaluated together; their slots are filled in afterwards
+    slime_slots: List[int] = []
+    slimes: List[Enemy] = []
+    # AI functions are pure over well-formed Enemy objects (id is a required field),
+    # so there is one guard per tick rather than one per enemy
+    try:
+        for i, enemy in enumerate(enemies.values()):
+            type_id = enemy.type_id
+            if type_id == _SLIME_ID:
+                slime_slots.append(i)
+                slimes.append(enemy)
+                continue
+            intents[i] = ai_by_id[type_id](enemy, world)
+        if slimes:
+            for slot, intent in zip(slime_slots, _slime_intents_batch(slimes, world)):
+                intents[slot] = intent
+    except Exception as e:
+        print(f"enemy_ai: intent pass failed, idling remaining enemies: {e}")
+        for i, enemy in enumerate(enemies.values()):
+            if intents[i] is None:
+                intents[i] = {'kind': 'idle', 'id': enemy.id}
     return intents
 
 
 # --- Boss AI (placeholder) ---
-def boss_ai(enemy: EnemyInst, world: WorldView) -> Intent:
+def boss_ai(enemy: Enemy, world: WorldView) -> Intent:
     """Basic boss behavior for now:
     - Prefer nearest player within 12 tiles; else slow wander.
     - Attack in melee when adjacent.
     Later we can extend to use item-based affinities (fear/desire/vulnerable).
     """
-    pos = enemy.get('pos', (0, 0))
-    state = enemy.setdefault('state', {})
-    roam_cd = state.get('roam_cd', 0.0)
+    pos = enemy.pos
 
-    target_info = _nearest_player(pos, world['players'])
+    target_info = _nearest_player(pos, world)
     if target_info is not None:
-        sid, (tx, ty), dist = target_info
-        if dist <= 1.0:
-            return {'kind': 'attack', 'id': enemy['id'], 'target_id': sid}
-        if dist <= 12.0:
-            dx = 1 if tx > pos[0] else (-1 if tx < pos[0] else 0)
-            dy = 1 if ty > pos[1] else (-1 if ty < pos[1] else 0)
-            if abs(tx - pos[0]) >= abs(ty - pos[1]):
-                return {'kind': 'move', 'id': enemy['id'], 'dx': dx, 'dy': 0}
+        sid, (tx, ty), d2 = target_info
+        if d2 <= 1:
+            return {'kind': 'attack', 'id': enemy.id, 'target_id': sid}
+        if d2 <= 144:  # 12 tiles
+            x, y = pos
+            adx = tx - x
+            ady = ty - y
+            if adx*adx >= ady*ady:
+                return {'kind': 'move', 'id': enemy.id, 'dx': (tx > x) - (tx < x), 'dy': 0}
             else:
-                return {'kind': 'move', 'id': enemy['id'], 'dx': 0, 'dy': dy}
+                return {'kind': 'move', 'id': enemy.id, 'dx': 0, 'dy': (ty > y) - (ty < y)}
 
     # Slow wander
+    roam_cd = enemy.roam_cd
     if roam_cd <= 0:
-        state['roam_cd'] = random.uniform(0.8, 2.2)
-        choice = random.choice([(1,0), (-1,0), (0,1), (0,-1), (0,0)])
-        if choice != (0,0):
-            return {'kind': 'move', 'id': enemy['id'], 'dx': choice[0], 'dy': choice[1]}
+        enemy.roam_cd = 0.8 + _rand() * 1.4
+        choice = _WANDER_CHOICES[int(_rand() * 5)]
+        if choice is not _IDLE:
+            return {'kind': 'move', 'id': enemy.id, 'dx': choice[0], 'dy': choice[1]}
     else:
-        state['roam_cd'] = max(0.0, roam_cd - 0.1)
-    return {'kind': 'idle', 'id': enemy['id']}
+        enemy.roam_cd = max(0.0, roam_cd - 0.1)
+    return {'kind': 'idle', 'id': enemy.id}
 
 
 # Register boss types to boss_ai
@@ -165,3 +375,10 @@ for _t in [
     'boss_earth_gravemaw', 'boss_earth_veythra', 'super_earth_sylthrak',
     'boss_fire_pyrrhion', 'boss_fire_ignivrax', 'super_fire_cindralok', 'super_fire_ignivrax']:
     AI_DISPATCH[_t] = boss_ai
+
+# Hot-path dispatch: enemies carry an int type_id indexing _AI_BY_ID.
+# AI_DISPATCH stays the string-keyed registry; _TYPE_IDS is derived from it.
+_SLIME_ID = 0
+_BOSS_ID = 1
+_AI_BY_ID = (slime_ai, boss_ai)
+_TYPE_IDS: Dict[str, int] = {t: _AI_BY_ID.index(fn) for t, fn in AI_DISPATCH.items()}
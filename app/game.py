@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 def _load_scaled_image(path: str, w: int, h: int) -> 'pygame.Surface':
-    key = (path, w, h)
+    key = (sys.intern(path), w, h)
     surf = _ENEMY_SPRITE_CACHE.get(key)
     if surf is not None:
         return surf
     try:
         img = pygame.image.load(path).convert_alpha()
-        surf = pygame.transform.smoothscale(img, (w, h))
+        surf = pygame.transform.smoothscale(img, (w, h)).convert_alpha()
         _ENEMY_SPRITE_CACHE[key] = surf
         return surf
     except Exception:
@@ -19,27 +19,105 @@ def _resolve_enemy_image_file(img_name: str) -> str:
     return os.path.join('static', 'img', 'items', img_name)
 
 
-def _get_enemy_sprite(etype: str, info: Dict[str, Any]) -> Tuple['pygame.Surface', int, int]:
-    """Return (sprite_surface, w, h) or (None, 0, 0) if not available.
-    Bosses are rendered larger (~128x256). Slimes at 64x64.
+def _enemy_sprite_size(info: Dict[str, Any]) -> Tuple[int, int]:
+    """Sprite size policy: bosses ~128x256 (super tier slightly bigger), everything else 64x64."""
+    if info.get('boss'):
+        if (info.get('tier') or '').lower() == 'super':
+            return 144, 288
+        return 128, 256
+    return 64, 64
+
+
+def _enemy_sprite_keys() -> List[Tuple[str, int, int]]:
+    """Distinct (path, w, h) sprite keys across all enemy types, in type-map order."""
+    keys = {}
+    for info in get_enemy_type_map().values():
+        img_name = info.get('image')
+        if img_name:
+            w, h = _enemy_sprite_size(info)
+            keys[(_resolve_enemy_image_file(img_name), w, h)] = None
+    return list(keys)
+
+
+def _decode_scaled(key: Tuple[str, int, int]) -> Optional['pygame.Surface']:
+    """Thread-pool worker: decode and smoothscale one sprite without touching the display."""
+    path, w, h = key
+    try:
+        img = pygame.image.load(path)
+        if img.get_bitsize() < 24:
+            # smoothscale needs 24/32-bit pixels; widen paletted images without a display format
+            rgba = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+            rgba.blit(img, (0, 0))
+            img = rgba
+        return pygame.transform.smoothscale(img, (w, h))
+    except Exception:
+        return None
+
+
+def prewarm_enemy_sprites() -> None:
+    """Decode and scale every enemy sprite on a thread pool, then pack the atlas.
+    Only file decode and scaling run in the workers; display-format conversion stays on this thread.
+    """
+    keys = [k for k in _enemy_sprite_keys() if k not in _ENEMY_SPRITE_CACHE and k not in _ENEMY_ATLAS]
+    if keys:
+        with ThreadPoolExecutor(max_workers=min(len(keys), os.cpu_count() or 1)) as ex:
+            for key, surf in zip(keys, ex.map(_decode_scaled, keys)):
+                if surf is not None:
+                    try:
+                        _ENEMY_SPRITE_CACHE[key] = surf.convert_alpha()
+                    except Exception:
+                        pass  # no display mode yet; _load_scaled_image will retry on demand
+    _build_enemy_atlas()
+
+
+def _build_enemy_atlas() -> None:
+    """Shelf-pack every enemy type's scaled sprite into one SRCALPHA surface.
+    Fills _ENEMY_ATLAS with (path, w, h) -> (atlas, Rect) so blits share a single source surface.
+    """
+    entries = []
+    seen = _enemy_sprite_keys()
+    for key in seen:
+        surf = _load_scaled_image(*key)
+        if surf is not None:
+            entries.append((key, surf))
+    # Tallest first so each shelf wastes little height
+    entries.sort(key=lambda e: e[0][2], reverse=True)
+    placed = []
+    x = y = shelf_h = 0
+    for key, surf in entries:
+        w, h = key[1], key[2]
+        if x and x + w > ENEMY_ATLAS_W:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        placed.append((key, surf, pygame.Rect(x, y, w, h)))
+        x += w
+        shelf_h = max(shelf_h, h)
+    atlas = pygame.Surface((ENEMY_ATLAS_W, max(1, y + shelf_h)), pygame.SRCALPHA)
+    _ENEMY_ATLAS.clear()
+    for key, surf, rect in placed:
+        atlas.blit(surf, rect)
+        _ENEMY_ATLAS[key] = (atlas, rect)
+        # The atlas now holds the pixels; drop the standalone copy
+        _ENEMY_SPRITE_CACHE.pop(key, None)
+    for key in seen:
+        _ENEMY_ATLAS.setdefault(key, None)
+
+
+def _get_enemy_sprite(etype: str, info: Dict[str, Any]) -> Tuple[Optional['pygame.Surface'], Optional['pygame.Rect'], int, int]:
+    """Return (atlas_surface, source_rect, w, h) or (None, None, 0, 0) if not available.
+    Blit with screen.blit(atlas, dest, area=rect). Bosses are rendered larger (~128x256). Slimes at 64x64.
     """
     img_name = info.get('image')
     if not img_name:
-        return (None, 0, 0)
-    is_boss = bool(info.get('boss'))
-    tier = (info.get('tier') or '').lower()
-    # Size policy
-    if is_boss:
-        w, h = 128, 256
-        if tier == 'super':
-            w, h = 144, 288  # slightly bigger
-    else:
-        w, h = 64, 64
-    path = _resolve_enemy_image_file(img_name)
-    surf = _load_scaled_image(path, w, h)
-    if surf is None:
-        return (None, 0, 0)
-    return (surf, w, h)
+        return (None, None, 0, 0)
+    w, h = _enemy_sprite_size(info)
+    key = (_resolve_enemy_image_file(img_name), w, h)
+    if key not in _ENEMY_ATLAS:
+        # First use, or a type added since the last build (config reload)
+        _build_enemy_atlas()
+    hit = _ENEMY_ATLAS.get(key)
+    if hit is None:
+        return (None, None, 0, 0)
+    return (hit[0], hit[1], w, h)
 
 
 # Cache natural image sizes to avoid reloading every frame
@@ -69,7 +147,7 @@ def _get_tile_image(img_name: str, w: int, h: int) -> 'pygame.Surface':
         if surf is not None:
             return surf
         img = pygame.image.load(path).convert_alpha()
-        surf = pygame.transform.smoothscale(img, (int(w), int(h)))
+        surf = pygame.transform.smoothscale(img, (int(w), int(h))).convert_alpha()
         _TILE_IMG_CACHE[key] = surf
         return surf
     except Exception:
@@ -87,8 +165,15 @@ def _get_image_natural_size(img_name: str):
     if wh:
         return wh
     try:
-        img = pygame.image.load(path)
-        wh = (int(img.get_width()), int(img.get_height()))
+        # PNG keeps width/height big-endian in the IHDR chunk right after the signature;
+        # read them from the header instead of decoding the whole image
+        with open(path, 'rb') as f:
+            head = f.read(24)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            wh = struct.unpack('>II', head[16:24])
+        else:
+            img = pygame.image.load(path)
+            wh = (int(img.get_width()), int(img.get_height()))
     except Exception:
         wh = (64, 64)
     _IMAGE_SIZE_CACHE[path] = wh
@@ -106,7 +191,11 @@ def _get_item_icon(icon_name: str, w: int = 16, h: int = 16) -> 'pygame.Surface'
         if not (os.path.sep in icon_name or '/' in icon_name):
             path = os.path.join('static', 'img', 'items', icon_name)
         img = pygame.image.load(path).convert_alpha()
-        surf = pygame.transform.smoothscale(img, (w, h))
+        # Nearest-neighbour is indistinguishable at thumbnail sizes and skips the filter pass
+        if max(w, h) <= 24:
+            surf = pygame.transform.scale(img, (w, h)).convert_alpha()
+        else:
+            surf = pygame.transform.smoothscale(img, (w, h)).convert_alpha()
         _ITEM_ICON_CACHE[key] = surf
         return surf
     except Exception:
@@ -114,45 +203,71 @@ def _get_item_icon(icon_name: str, w: int = 16, h: int = 16) -> 'pygame.Surface'
 
 # SkeletonGame/app/game.py
 import random
-import copy
 import time
 import math
 import os
 import pygame
 import hashlib
-from typing import Dict, Tuple, List, Any
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+import numpy as np
+try:
+    from numba import njit, prange
+except ImportError:  # optional JIT for the enemy tick and raycaster; pure-Python paths are the fallback
+    njit = None
+    prange = range
+from typing import Dict, Tuple, List, Any, Optional
+from bisect import bisect_left
+from collections import OrderedDict
 from app.server import players, socketio
 from app import config as game_config
-from app.items import ITEM_DB, get_weight, backpack_capacity, register_item, get_item
+from app.items import ITEM_DB, get_weight, backpack_capacity, register_item, get_item, spawnable_item_ids
 from app import enemy_ai
 
 # --- Rendering tuning helpers ---
+# Parsed curves keyed by id(points); each entry keeps a reference to its points list so the id stays valid
+_CURVE_CACHE: Dict[int, Tuple[Any, Optional[Tuple[List[float], List[float]]]]] = {}
+
+
+def _parse_curve(points) -> Optional[Tuple[List[float], List[float]]]:
+    """Knot xs/ys sorted by x, or None when points is empty or malformed."""
+    try:
+        pts = sorted([(float(px), float(py)) for (px, py) in (points or [])], key=lambda p: p[0])
+    except (TypeError, ValueError):
+        return None
+    if not pts:
+        return None
+    return [p[0] for p in pts], [p[1] for p in pts]
+
+
 def _sample_curve(points: List[List[float]] | List[Tuple[float, float]], x: float, default: float = 1.0) -> float:
     """Sample a piecewise-linear curve defined by [[x0, y0], [x1, y1], ...].
     - If points is missing/invalid, return default.
     - If x is below first knot, return y0; if above last, return y_last.
     - Otherwise, linearly interpolate between surrounding knots.
+    Curves are parsed once per points object and searched with bisect.
     """
-    try:
-        pts = list(points or [])
-        if not pts:
-            return float(default)
-        # Ensure sorted by x
-        pts = sorted([(float(px), float(py)) for (px, py) in pts], key=lambda p: p[0])
-        if x <= pts[0][0]:
-            return float(pts[0][1])
-        if x >= pts[-1][0]:
-            return float(pts[-1][1])
-        # Find segment
-        for i in range(1, len(pts)):
-            x0, y0 = pts[i-1]
-            x1, y1 = pts[i]
-            if x0 <= x <= x1:
-                t = 0.0 if x1 == x0 else (float(x) - x0) / (x1 - x0)
-                return float(y0 + t * (y1 - y0))
-        return float(default)
-    except Exception:
+    cached = _CURVE_CACHE.get(id(points))
+    if cached is None or cached[0] is not points:
+        if len(_CURVE_CACHE) > 256:
+            _CURVE_CACHE.clear()  # config reloads hand us new lists; don't pin the old ones forever
+        cached = _CURVE_CACHE[id(points)] = (points, _parse_curve(points))
+    curve = cached[1]
+    if curve is None:
         return float(default)
+    xs, ys = curve
+    if x <= xs[0]:
+        return ys[0]
+    if x >= xs[-1]:
+        return ys[-1]
+    i = bisect_left(xs, x)
+    x0, x1 = xs[i - 1], xs[i]
+    y0 = ys[i - 1]
+    t = 0.0 if x1 == x0 else (float(x) - x0) / (x1 - x0)
+    return y0 + t * (ys[i] - y0)
+
 
 # Screen and board
 SCREEN_WIDTH = 1280
@@ -185,11 +300,22 @@ WALL = 1
 # Special tile type id for biome spawners (entity metadata; grid remains EMPTY)
 SPAWNER_TILE = 2
 
+# Occupancy sets are keyed by packed cells: (y << CELL_SHIFT) | x.
+# CELL_SHIFT is log2(GRID_W), so a key is also the flat index y * GRID_W + x into a grid array.
+CELL_SHIFT = GRID_W.bit_length() - 1
+assert GRID_W == 1 << CELL_SHIFT, "packed cell keys need a power-of-two GRID_W"
+CELL_MASK = (1 << CELL_SHIFT) - 1
+
+
+def cell_key(x: int, y: int) -> int:
+    return (y << CELL_SHIFT) | x
+
+
 # Grid and occupancy
-grid = None  # will be a list[list[int]] sized GRID_H x GRID_W
-occupied: Dict[Tuple[int, int], str] = {}
-## Per-wall tile hitpoints; 0 for non-walls
-wall_hp: List[List[int]] = []
+grid: np.ndarray | None = None  # uint8 array shaped (GRID_H, GRID_W); index as grid[y, x]
+occupied: Dict[int, str] = {}  # packed cell -> player sid
+## Per-wall tile hitpoints; 0 for non-walls (int32: outer walls use durability ~1e9)
+wall_hp: np.ndarray | None = None
 WALL_HP_BASE: int = 3
 WALL_HP_PER_BIOME: int = 1
 
@@ -207,36 +333,123 @@ START_PILLAR_PLACED: bool = False
 TEST_ITEMS_SPAWNED: bool = False
 # World log flag
 WORLD_LOG_WRITTEN: bool = False
-# Cells blocked by solid entities (e.g., items/props/spawners)
+# Packed cells blocked by solid entities (e.g., items/props/spawners)
 solid_cells: set = set()
 
 # Enemy instances and occupancy
 enemies: Dict[str, Dict[str, Any]] = {}
+# Bumped whenever an enemy is added or removed; the enemy SoA caches rebuild when it changes
+enemy_rev: int = 0
 random_enemies_inited: bool = False
 # Persisted room metadata for logging/QA
 ROOMS: List[Dict[str, Any]] = []
 
-def enemy_occupied_cells() -> Dict[Tuple[int,int], str]:
-    occ: Dict[Tuple[int,int], str] = {}
-    for eid, e in enemies.items():
-        pos = e.get('pos')
-        if not pos:
-            continue
-        cx, cy = int(pos[0]), int(pos[1])
-        occ[(cx, cy)] = eid
-    return occ
+# Packed cell -> enemy id; updated in place on spawn and on every enemy move
+enemy_cell_index: Dict[int, str] = {}
+# Packed cell -> world entity id; kept current by _index_entity() and rebuild_solid_cells()
+entity_cell_index: Dict[int, str] = {}
+_entity_id_seq: int = 0
+# Reservoir of candidate spawn cells as packed y*GRID_W+x keys; entries [0, _empty_pool_n) are live
+_empty_cell_pool: np.ndarray | None = None
+_empty_pool_n: int = 0
+
+def enemy_occupied_cells() -> Dict[int, str]:
+    """Packed cells occupied by enemies (live index; copy it before mutating)."""
+    return enemy_cell_index
+
+# Movement blockers packed one bit per source; a cell is passable iff its byte is 0
+BLK_WALL = 1
+BLK_SOLID = 2
+BLK_PLAYER = 4
+BLK_ENEMY = 8
+# uint8 (GRID_H, GRID_W); built on first use, then kept current by the _blk_* helpers
+blockers: np.ndarray | None = None
+
+
+def get_blockers() -> np.ndarray:
+    global blockers
+    if blockers is None:
+        b = np.where(grid != EMPTY, BLK_WALL, 0).astype(np.uint8)
+        flat = b.reshape(-1)
+        flat[list(solid_cells)] |= BLK_SOLID
+        flat[list(occupied)] |= BLK_PLAYER
+        flat[list(enemy_cell_index)] |= BLK_ENEMY
+        blockers = b
+    return blockers
+
+
+def _blk_set(x: int, y: int, bit: int) -> None:
+    if blockers is not None:
+        blockers[y, x] |= bit
+
+
+def _blk_clear(x: int, y: int, bit: int) -> None:
+    if blockers is not None:
+        blockers[y, x] &= 0xFF ^ bit
+
+
+def add_enemy(inst: Dict[str, Any]) -> None:
+    """Register a new enemy instance with its cell index and blocker bit.
+    All enemy adds go through here so enemy_rev stays in step with the enemy set.
+    """
+    global enemy_rev
+    x, y = int(inst['pos'][0]), int(inst['pos'][1])
+    enemies[inst['id']] = inst
+    enemy_cell_index[cell_key(x, y)] = inst['id']
+    _blk_set(x, y, BLK_ENEMY)
+    enemy_rev += 1
+
+
+def remove_enemy(eid: str) -> Optional[Dict[str, Any]]:
+    """Drop an enemy and free its cell; returns the removed instance, or None if unknown."""
+    global enemy_rev
+    inst = enemies.pop(eid, None)
+    if inst is None:
+        return None
+    x, y = int(inst['pos'][0]), int(inst['pos'][1])
+    ck = cell_key(x, y)
+    if enemy_cell_index.get(ck) == eid:
+        del enemy_cell_index[ck]
+        _blk_clear(x, y, BLK_ENEMY)
+    enemy_rev += 1
+    return inst
 
 # Cache of enemy type definitions by type id for rendering pings
 _ENEMY_TYPE_MAP: Dict[str, Dict[str, Any]] = {}
+# (normal, sub_boss, big_boss) type ids, rebuilt together with _ENEMY_TYPE_MAP
+_ENEMY_TYPE_LISTS: Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]] = ((), (), ())
 _WALL_TYPE_MAP: Dict[str, Dict[str, Any]] = {}
 # Sprite caches
 _ENEMY_SPRITE_CACHE: Dict[Tuple[str, int, int], pygame.Surface] = {}
+# Enemy sprites stitched into one surface by _build_enemy_atlas(): (path, w, h) -> (atlas, Rect), None if unloadable
+_ENEMY_ATLAS: Dict[Tuple[str, int, int], Optional[Tuple[pygame.Surface, pygame.Rect]]] = {}
+ENEMY_ATLAS_W = 1024
 _ITEM_ICON_CACHE: Dict[Tuple[str, int, int], pygame.Surface] = {}
 _TILE_IMG_CACHE: Dict[Tuple[str, int, int], pygame.Surface] = {}
 
 def clamp(v: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, int(v)))
 
+def _copy_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a stats dict for a new instance. Stats are flat numbers, so a plain dict copy is
+    enough; any list/dict value is copied one level down so instances never share it.
+    """
+    out = dict(stats)
+    for k, v in out.items():
+        if isinstance(v, list):
+            out[k] = list(v)
+        elif isinstance(v, dict):
+            out[k] = dict(v)
+    return out
+
+
+def set_ping_colour(inst: Dict[str, Any], rgb: List[int]) -> None:
+    """Override an enemy's radar ping colour, keeping the resolved ping_rgba and ping_key the renderers read in sync."""
+    inst['pingcolour'] = rgb
+    inst['ping_rgba'] = (int(rgb[0]), int(rgb[1]), int(rgb[2]), 140)
+    inst['ping_key'] = _pack_rgba(inst['ping_rgba'])
+
+
 def make_enemy_instance(etype: str, cx: int, cy: int, spawner_id: str = None) -> Dict[str, Any]:
     """Materialize an enemy instance from its type template at cell (cx, cy).
     Copies all attributes so per-instance mutation does not affect the template.
@@ -244,7 +457,7 @@ def make_enemy_instance(etype: str, cx: int, cy: int, spawner_id: str = None) ->
     """
     types = get_enemy_type_map()
     tdef = dict(types.get(str(etype), {}))
-    stats_base = copy.deepcopy(tdef.get('stats') or {})
+    stats_base = _copy_stats(tdef.get('stats') or {})
     # Ensure required stats with defaults
     for k, dv in (
         ('health', 1),
@@ -258,10 +471,10 @@ def make_enemy_instance(etype: str, cx: int, cy: int, spawner_id: str = None) ->
         if k not in stats_base:
             stats_base[k] = dv
     stats_base['speed'] = clamp(stats_base.get('speed', 0), 0, 256)
-    stats_current = copy.deepcopy(stats_base)
+    stats_current = _copy_stats(stats_base)
     # Determine biome at spawn
     try:
-        b = int(biomes[cy][cx]) if (0 <= cy < len(biomes) and 0 <= cx < len(biomes[0])) else 0
+        b = int(biomes[cy, cx]) if (biomes is not None and 0 <= cy < GRID_H and 0 <= cx < GRID_W) else 0
     except Exception:
         b = 0
     # Build instance
@@ -293,31 +506,109 @@ def make_enemy_instance(etype: str, cx: int, cy: int, spawner_id: str = None) ->
         'sprite_w': spr_w,
         'sprite_h': spr_h,
     }
-    # Initialize timer with slight jitter so not all enemies move together
+    # Resolved radar ping style so render loops do no per-frame type lookups
+    try:
+        pcol = tdef.get('pingcolour', [255, 0, 255])  # magenta default
+        inst['ping_rgba'] = (int(pcol[0]), int(pcol[1]), int(pcol[2]), 140)
+    except Exception:
+        inst['ping_rgba'] = (255, 0, 255, 140)
+    inst['ping_key'] = _pack_rgba(inst['ping_rgba'])
+    # Boss scale: sub boss x1.6, super boss x2.2
+    inst['ping_scale'] = (2.2 if tier == 'super' else 1.6) if is_boss else 1.0
+    # Seconds between moves, fixed by speed at spawn (None = never moves)
     interval = None
     try:
         interval = None if inst['speed'] <= 0 else (3.0 - 2.0 * ((clamp(inst['speed'], 1, 256) - 1) / (256 - 1)))
     except Exception:
         interval = None
+    inst['interval'] = interval
+    # Initialize timer with slight jitter so not all enemies move together
     if interval is not None and interval > 0:
         now = time.time()
         inst['next_move_ts'] = now + random.uniform(0.0, interval)
     # Initialize a random direction (not 0,0)
-    dirs = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if not (dx == 0 and dy == 0)]
-    rdx, rdy = random.choice(dirs)
-    inst['dir'] = [int(rdx), int(rdy)]
+    rdx, rdy = _ENEMY_DIRS[random.randrange(8)]
+    inst['dir'] = [rdx, rdy]
     return inst
 
 def get_enemy_type_map() -> Dict[str, Dict[str, Any]]:
-    global _ENEMY_TYPE_MAP
+    global _ENEMY_TYPE_MAP, _ENEMY_TYPE_LISTS
     if not _ENEMY_TYPE_MAP:
         try:
             types = game_config.get_enemy_types()
             _ENEMY_TYPE_MAP = {t.get('type'): t for t in types if t.get('type')}
         except Exception:
             _ENEMY_TYPE_MAP = {}
+        # Classify in the same pass that (re)builds the map
+        normal, sub_boss, big_boss = [], [], []
+        for t_id, info in _ENEMY_TYPE_MAP.items():
+            if bool(info.get('boss')):
+                if (info.get('tier') or '').lower() == 'super':
+                    big_boss.append(t_id)
+                else:
+                    sub_boss.append(t_id)
+            else:
+                normal.append(t_id)
+        _ENEMY_TYPE_LISTS = (tuple(normal), tuple(sub_boss), tuple(big_boss))
     return _ENEMY_TYPE_MAP
 
+# Sprite-sheet animations are sampled on a fixed time grid: one LUT slot per ANIM_LUT_STEP_MS
+ANIM_LUT_STEP_MS = 10
+ANIM_LUT_PER_SEC = 1000 // ANIM_LUT_STEP_MS
+
+
+def anim_frame_lut(st_def: Optional[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """Expand a sheet state {'frames': [[col, row], ...], 'frame_ms': n} into a per-step (col, row) table.
+    Indexing it with int(anim_t * ANIM_LUT_PER_SEC) % len(lut) replaces the per-tick modulo/divide/min.
+    """
+    if not st_def:
+        return []
+    frames = st_def.get('frames') or []
+    if not frames:
+        return []
+    frame_ms = max(1, int(st_def.get('frame_ms', 180)))
+    frames = [(int(fc), int(fr)) for fc, fr in frames]
+    last = len(frames) - 1
+    steps = max(1, -(-frame_ms * len(frames) // ANIM_LUT_STEP_MS))
+    return [frames[min(last, (k * ANIM_LUT_STEP_MS) // frame_ms)] for k in range(steps)]
+
+
+# Phone billboard constants per enemy type, rebuilt after a config reload:
+# type -> (img, base_w, base_h, aspect, scale_curve, y_bias_curve), or None when the type has no image
+_ENEMY_PROJ_CACHE: Dict[str, Optional[Tuple[str, int, int, float, list, list]]] = {}
+_ENEMY_PROJ_GEN: int = -1
+
+
+def enemy_projection(etype: str) -> Optional[Tuple[str, int, int, float, list, list]]:
+    global _ENEMY_PROJ_GEN
+    gen = game_config.config_generation()
+    if gen != _ENEMY_PROJ_GEN:
+        _ENEMY_PROJ_CACHE.clear()
+        _ENEMY_PROJ_GEN = gen
+    try:
+        return _ENEMY_PROJ_CACHE[etype]
+    except KeyError:
+        pass
+    info = get_enemy_type_map().get(etype) or {}
+    image = info.get('image')
+    proj = None
+    if image:
+        # Use the actual PNG intrinsic size so slicing uses the full sprite
+        base_w, base_h = _get_image_natural_size(image)
+        rblock = (info.get('render') or {}) if isinstance(info.get('render'), dict) else {}
+        try:
+            tuning = (game_config.get_game_config() or {}).get('tuning') or {}
+        except Exception:
+            tuning = {}
+        proj = (
+            f'items/{image}', base_w, base_h, base_w / max(1, base_h),
+            rblock.get('scale_curve') or tuning.get('enemy_scale_curve_default') or [],
+            rblock.get('y_bias_curve') or tuning.get('enemy_y_bias_curve_default') or [],
+        )
+    _ENEMY_PROJ_CACHE[etype] = proj
+    return proj
+
+
 def get_wall_type_map() -> Dict[str, Dict[str, Any]]:
     """Load and cache wall type definitions keyed by 'type'."""
     global _WALL_TYPE_MAP
@@ -330,48 +621,202 @@ def get_wall_type_map() -> Dict[str, Dict[str, Any]]:
     return _WALL_TYPE_MAP
 
 
-def render_enemy_pings(screen: pygame.surface.Surface, visible: List[List[bool]] = None):
+# Ping ring surfaces reused across frames, keyed by _pack_rgba(colour) << 16 | radius_px.
+# Radii follow the viewport zoom, so the cache is an LRU capped at PING_SURF_CACHE_MAX rings.
+PING_SURF_CACHE_MAX = 128
+_PING_SURF_CACHE: "OrderedDict[int, pygame.Surface]" = OrderedDict()
+
+
+def _pack_rgba(rgba: Tuple[int, int, int, int]) -> int:
+    """Pack an (R, G, B, A) colour into one int; ints hash much faster than tuples as cache keys."""
+    return (rgba[0] << 24) | (rgba[1] << 16) | (rgba[2] << 8) | rgba[3]
+
+
+# The ping pulse is quantized to PING_PHASES radii (4..16 px) so every ring can be pre-baked
+PING_PHASES = 8
+_PING_PHASE_RADII = tuple(4 + step * 12 // (PING_PHASES - 1) for step in range(PING_PHASES))
+# Baked rings per (packed RGBA, ping_scale) at the current viewport zoom: one (surface, centre offset) per pulse phase
+_PING_FRAMES: Dict[Tuple[int, float], List[Tuple[pygame.Surface, int]]] = {}
+# Zoom the baked rings were drawn for; only one zoom is live per frame, so a change drops the table
+_PING_FRAMES_ZOOM = 1.0
+
+
+def _ping_phase(t: float) -> int:
+    """Index into _PING_PHASE_RADII for the pulse at time t."""
+    return min(PING_PHASES - 1, int((math.sin(t * 2.0) + 1.0) * (PING_PHASES / 2)))
+
+
+def _ping_frames(rgba_key: int, scale: float, zoom_k: float = 1.0) -> List[Tuple[pygame.Surface, int]]:
+    """All pulse phases of one ping ring, baked once: [(surface, offset from cell centre to blit corner)].
+    Surfaces are alpha-premultiplied; blit them with special_flags=pygame.BLEND_PREMULTIPLIED.
+    rgba_key is the enemy's packed ping colour (inst['ping_key']).
+    """
+    global _PING_FRAMES_ZOOM
+    if zoom_k != _PING_FRAMES_ZOOM:
+        _PING_FRAMES.clear()
+        _PING_FRAMES_ZOOM = zoom_k
+    key = (rgba_key, scale)
+    frames = _PING_FRAMES.get(key)
+    if frames is None:
+        color_a = ((rgba_key >> 24) & 255, (rgba_key >> 16) & 255, (rgba_key >> 8) & 255, rgba_key & 255)
+        frames = []
+        for base_r in _PING_PHASE_RADII:
+            r = max(4, int(base_r * scale))
+            if zoom_k != 1.0:
+                r = max(1, int(zoom_k * r))
+            # Premultiplied copy: blitted with BLEND_PREMULTIPLIED, which skips the per-pixel divide
+            frames.append((_get_ping_surface(color_a, r).premul_alpha(), r + 2))
+        _PING_FRAMES[key] = frames
+    return frames
+
+
+def _get_ping_surface(color_a: Tuple[int,int,int,int], r: int) -> pygame.Surface:
+    key = (_pack_rgba(color_a) << 16) | r
+    surf = _PING_SURF_CACHE.get(key)
+    if surf is not None:
+        _PING_SURF_CACHE.move_to_end(key)
+    else:
+        size = r * 2 + 4
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color_a, (r+2, r+2), r, width=2)
+        try:
+            surf = surf.convert_alpha()
+        except Exception:
+            pass  # no display mode yet; blit unconverted
+        _PING_SURF_CACHE[key] = surf
+        if len(_PING_SURF_CACHE) > PING_SURF_CACHE_MAX:
+            _PING_SURF_CACHE.popitem(last=False)
+    return surf
+
+
+# Boolean disc masks keyed by reveal radius, shared by every player's fog update
+_REVEAL_MASKS: Dict[int, np.ndarray] = {}
+
+
+def reveal_around(seen: np.ndarray, cx: int, cy: int, r: int) -> None:
+    """OR a radius-r disc centred on (cx, cy) into a (GRID_H, GRID_W) bool seen mask."""
+    mask = _REVEAL_MASKS.get(r)
+    if mask is None:
+        d = np.arange(-r, r + 1) ** 2
+        mask = _REVEAL_MASKS[r] = np.add.outer(d, d) <= r * r
+    y0, y1 = max(0, cy - r), min(GRID_H, cy + r + 1)
+    x0, x1 = max(0, cx - r), min(GRID_W, cx + r + 1)
+    if y0 >= y1 or x0 >= x1:
+        return
+    my0, mx0 = y0 - (cy - r), x0 - (cx - r)
+    seen[y0:y1, x0:x1] |= mask[my0:my0 + (y1 - y0), mx0:mx0 + (x1 - x0)]
+
+
+def _visible_bounds(visible) -> Optional[Tuple[int, int, int, int]]:
+    """Tight (minx, maxx, miny, maxy) box around the True cells of a visibility
+    mask, or None when nothing is visible. Accepts list-of-lists or a bool ndarray.
+    """
+    if visible is None:
+        return None
+    if isinstance(visible, np.ndarray):
+        xs = np.flatnonzero(visible.any(axis=0))
+        ys = np.flatnonzero(visible.any(axis=1))
+        if xs.size == 0:
+            return None
+        return int(xs[0]), int(xs[-1]), int(ys[0]), int(ys[-1])
+    minx = maxx = miny = maxy = None
+    for y, row in enumerate(visible):
+        if True not in row:
+            continue
+        lo = row.index(True)
+        hi = len(row) - 1 - row[::-1].index(True)
+        if miny is None:
+            miny, minx, maxx = y, lo, hi
+        else:
+            minx = min(minx, lo)
+            maxx = max(maxx, hi)
+        maxy = y
+    if miny is None:
+        return None
+    return minx, maxx, miny, maxy
+
+
+# Enemy positions as an (N, 2) float array for per-frame view work (radar pings, billboards).
+# Rebuilt when enemy_rev changes; _enemy_view_moved patches the rows tick_enemies moved.
+_enemy_view_soa: Dict[str, Any] = {}
+
+
+def _enemy_view_sync() -> Dict[str, Any]:
+    global _enemy_view_soa
+    if _enemy_view_soa.get('rev') == enemy_rev:
+        return _enemy_view_soa
+    ents = [e for e in enemies.values() if e.get('pos') and len(e['pos']) >= 2]
+    pos = np.array([(float(e['pos'][0]), float(e['pos'][1])) for e in ents], dtype=np.float64).reshape(-1, 2)
+    _enemy_view_soa = {
+        'rev': enemy_rev, 'ents': ents, 'pos': pos,
+        'types': [str(e.get('type', '')) for e in ents],
+        'index': {e.get('id'): i for i, e in enumerate(ents)},
+    }
+    return _enemy_view_soa
+
+
+def _enemy_view_moved(moves: List[Tuple[str, float, float]]) -> None:
+    soa = _enemy_view_soa
+    if soa.get('rev') != enemy_rev:
+        return  # stale anyway; the next sync rebuilds from the dicts
+    index = soa['index']
+    pos = soa['pos']
+    for eid, x, y in moves:
+        i = index.get(eid)
+        if i is not None:
+            pos[i, 0] = x
+            pos[i, 1] = y
+
+
+def enemies_in_view(box: Optional[Tuple[int, int, int, int]], visible: Optional[np.ndarray] = None):
+    """(enemy, cx, cy) for each enemy whose cell lies in box (minx, maxx, miny, maxy) and,
+    when given, is True in the (GRID_H, GRID_W) bool mask `visible`. Both filters run as one
+    array pass over all enemy cells; box=None skips the box test.
+    """
+    soa = _enemy_view_sync()
+    ents = soa['ents']
+    if not ents:
+        return []
+    cells = soa['pos'].astype(np.intp)
+    xs = cells[:, 0]
+    ys = cells[:, 1]
+    if box is not None:
+        minx, maxx, miny, maxy = box
+        idx = np.flatnonzero((xs >= minx) & (xs <= maxx) & (ys >= miny) & (ys <= maxy))
+    else:
+        idx = np.flatnonzero((xs >= 0) & (xs < GRID_W) & (ys >= 0) & (ys < GRID_H))
+    if visible is not None:
+        idx = idx[visible[ys[idx], xs[idx]]]
+    return [(ents[i], x, y) for i, x, y in zip(idx.tolist(), xs[idx].tolist(), ys[idx].tolist())]
+
+
+def render_enemy_pings(screen: pygame.surface.Surface, visible: List[List[bool]] = None,
+                       bounds: Optional[Tuple[int, int, int, int]] = None):
     """Draw pulsing radar pings at enemy positions using their type pingcolour.
     On by default; later can be gated by configs or player items.
+    `bounds` is the (minx, maxx, miny, maxy) box of `visible`; computed if omitted.
     """
     if not enemies:
         return
-    types = get_enemy_type_map()
-    t = time.time()
-    # Pre-make surface per distinct colour and size to reduce overdraw setup
-    surf_cache: Dict[Tuple[int,int,int,int,int], pygame.Surface] = {}
-
-    for e in enemies.values():
-        etype = str(e.get('type', ''))
-        info = types.get(etype) or {}
-        col = info.get('pingcolour', [255, 0, 255])  # magenta default
-        # Boss scale: sub boss x1.6, super boss x2.2
-        is_boss = bool(info.get('boss'))
-        tier = (info.get('tier') or '').lower()
-        scale = 1.0
-        if is_boss:
-            scale = 2.2 if tier == 'super' else 1.6
-        # pulse radius in pixels (base 4..16)
-        base_r = 4 + int((math.sin(t * 2.0) + 1.0) * 0.5 * 12)
-        r = max(4, int(base_r * scale))
-        size = r * 2 + 4
-        color_a = (int(col[0]), int(col[1]), int(col[2]), 140)
-        cache_key = (color_a[0], color_a[1], color_a[2], color_a[3], r)
-        surf = surf_cache.get(cache_key)
-        if surf is None:
-            surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color_a, (r+2, r+2), r, width=2)
-            surf_cache[cache_key] = surf
-        pos = e.get('pos')
-        if not pos:
-            continue
-        cx, cy = int(pos[0]), int(pos[1])
-        if visible is not None:
-            if not (0 <= cy < len(visible) and 0 <= cx < len(visible[0]) and visible[cy][cx]):
-                continue
+    if visible is not None:
+        if bounds is None:
+            bounds = _visible_bounds(visible)
+        if bounds is None:
+            return
+    phase = _ping_phase(time.time())
+    half = TILE_SIZE // 2
+    draws = []
+    if visible is not None:
+        in_view = enemies_in_view(bounds, np.asarray(visible, dtype=bool))
+    else:
+        in_view = [(e, int(e['pos'][0]), int(e['pos'][1])) for e in enemies.values() if e.get('pos')]
+    for e, cx, cy in in_view:
+        surf, off = _ping_frames(e['ping_key'], e['ping_scale'])[phase]
         px, py = cell_to_px(cx, cy)
         # center over tile
-        screen.blit(surf, (px + TILE_SIZE//2 - (r+2), py + TILE_SIZE//2 - (r+2)))
+        draws.append((surf, (px + half - off, py + half - off), None, pygame.BLEND_PREMULTIPLIED))
+    if draws:
+        screen.blits(draws, doreturn=False)
 
 
 def _special_item_ids() -> List[str]:
@@ -381,21 +826,10 @@ def _special_item_ids() -> List[str]:
         return []
 
 
-def _enemy_type_lists() -> Tuple[List[str], List[str], List[str]]:
-    """Return (normal_types, sub_boss_types, big_boss_types)."""
-    types = get_enemy_type_map()
-    normal, sub_boss, big_boss = [], [], []
-    for t_id, info in types.items():
-        if not t_id:
-            continue
-        if bool(info.get('boss')):
-            if (info.get('tier') or '').lower() == 'super':
-                big_boss.append(t_id)
-            else:
-                sub_boss.append(t_id)
-        else:
-            normal.append(t_id)
-    return normal, sub_boss, big_boss
+def _enemy_type_lists() -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """Return (normal_types, sub_boss_types, big_boss_types), classified when the type map is built."""
+    get_enemy_type_map()
+    return _ENEMY_TYPE_LISTS
 
 
 def init_random_enemies_once():
@@ -428,8 +862,8 @@ def init_random_enemies_once():
         # find empty cell
         x, y = random_empty_cell()
         inst = make_enemy_instance(tid, x, y, spawner_id=None)
-        enemies[inst['id']] = inst
-        occ.add((x, y))
+        add_enemy(inst)
+        occ.add(cell_key(x, y))
         return inst
 
     # 1) Spawn 18 slimes, each carrying one unique special item (green ping)
@@ -449,7 +883,7 @@ def init_random_enemies_once():
         inst['carried_items'] = [itm]
         inst['carried_item'] = itm
         # Green ping for item carriers (non-boss)
-        inst['pingcolour'] = [60, 220, 60]
+        set_ping_colour(inst, [60, 220, 60])
 
     # 2) Spawn all bosses (sub=yellow, big=red)
     all_special = _special_item_ids()
@@ -459,7 +893,7 @@ def init_random_enemies_once():
     for tid in sub_boss_types:
         inst = _spawn_of_type(tid)
         spawned += 1
-        inst['pingcolour'] = [255, 255, 0]
+        set_ping_colour(inst, [255, 255, 0])
         # Assign 3 distinct items for affinities
         pool = list(all_special)
         random.shuffle(pool)
@@ -473,7 +907,7 @@ def init_random_enemies_once():
     for tid in big_boss_types:
         inst = _spawn_of_type(tid)
         spawned += 1
-        inst['pingcolour'] = [255, 60, 60]
+        set_ping_colour(inst, [255, 60, 60])
         # Build pool excluding used
         pool = [i for i in all_special if i not in used_big_affinity]
         random.shuffle(pool)
@@ -632,10 +1066,12 @@ def _spawn_pillars_for_scrolls(scroll_elems: List[Tuple[str, str]]) -> None:
                 'y_offset': 0,
             }
         }
+        ent['id'] = _new_entity_id()
         ents.append(ent)
-    # Append to world and rebuild solids
+    # Append to world and index the new solids
     world_entities.extend(ents)
-    rebuild_solid_cells()
+    for ent in ents:
+        _index_entity(ent)
 
 
 def ensure_knowledge_pillars_once() -> None:
@@ -664,26 +1100,41 @@ def ensure_knowledge_pillars_once() -> None:
             buckets[e].append(sid)
         else:
             buckets['other'].append(sid)
-    # Allocate scrolls to pillars; if a bucket is short, draw from others
+    # Allocate scrolls to pillars; if a bucket is short, draw from others.
+    # Each bucket is shuffled once and drawn by popping, so a drawn scroll is gone from its bucket.
+    for bucket in buckets.values():
+        random.shuffle(bucket)
     alloc: List[Tuple[str, str]] = []  # (scroll_id, pillar_element)
-    used: set = set()
+    have: Dict[str, int] = {}
     def take_from(bucket_name: str, need: int) -> List[str]:
+        bucket = buckets.get(bucket_name, [])
+        n = min(max(0, need), len(bucket))
+        picks = bucket[len(bucket) - n:]
+        del bucket[len(bucket) - n:]
+        return picks
+    def take_any(need: int) -> List[str]:
+        # Uniform draw across all remaining scrolls: pick a bucket weighted by its size, pop its end
         picks: List[str] = []
-        pool = [s for s in buckets.get(bucket_name, []) if s not in used]
-        random.shuffle(pool)
-        n = min(max(0, need), len(pool))
-        picks.extend(pool[:n])
-        for s in picks:
-            used.add(s)
+        names = ('water', 'earth', 'fire', 'other')
+        for _ in range(need):
+            total = sum(len(buckets[b]) for b in names)
+            if total == 0:
+                break
+            k = random.randrange(total)
+            for b in names:
+                if k < len(buckets[b]):
+                    picks.append(buckets[b].pop())
+                    break
+                k -= len(buckets[b])
         return picks
     # First, satisfy from matching buckets
     for elem_name, need in target.items():
         picks = take_from(elem_name, need)
         alloc.extend([(s, elem_name) for s in picks])
+        have[elem_name] = len(picks)
     # Top up deficits from any remaining scrolls (prefer same-element leftovers then others)
     for elem_name, need in target.items():
-        have = sum(1 for _sid, e in alloc if e == elem_name)
-        deficit = max(0, need - have)
+        deficit = max(0, need - have[elem_name])
         if deficit <= 0:
             continue
         # Prefer same-element leftovers first
@@ -692,12 +1143,7 @@ def ensure_knowledge_pillars_once() -> None:
         alloc.extend([(s, elem_name) for s in extra])
         if deficit > 0:
             # Pull from other + 'other'
-            leftovers = [s for bucket in ('water','earth','fire','other') for s in buckets.get(bucket, []) if s not in used]
-            random.shuffle(leftovers)
-            extra2 = leftovers[:deficit]
-            for s in extra2:
-                used.add(s)
-            alloc.extend([(s, elem_name) for s in extra2])
+            alloc.extend([(s, elem_name) for s in take_any(deficit)])
     # If we still have fewer than total target pillars due to limited scrolls, stop at available
     # Spawn pillars and pre-fill contents with allocated mapping
     _spawn_pillars_for_scrolls(alloc)
@@ -728,8 +1174,8 @@ def render_enemies(screen: pygame.surface.Surface, visible: List[List[bool]] = N
     """
     return
 
-# Biomes grid parallel to 'grid' holding biome id per tile: 0..6
-biomes: List[List[int]] = []
+# Biomes grid parallel to 'grid' holding biome id per tile: 0..6 (uint8)
+biomes: np.ndarray | None = None
 # Biome centers and radius used for rendering overlaps
 biome_centers: List[Tuple[int,int,int]] = []  # (cx, cy, biome_id)
 biome_radius: int = 0
@@ -747,13 +1193,65 @@ BIOME_SKY_COLORS: Dict[int, Tuple[int,int,int]] = {
     5: (150, 200, 255),   # blue
     6: (200, 150, 255),   # purple
 }
+# Flat lookups indexed by biome id: tuples for the per-cell path, uint8 rows for bulk use
+_BIOME_SKY_TUPLES: Tuple[Tuple[int,int,int], ...] = tuple(BIOME_SKY_COLORS[i] for i in range(len(BIOME_SKY_COLORS)))
+_BIOME_SKY_LUT = np.array(_BIOME_SKY_TUPLES, dtype=np.uint8)
 
 def biome_sky_colour_at(cx: int, cy: int) -> Tuple[int,int,int]:
-    try:
-        bid = int(biomes[cy][cx]) if (0 <= cy < len(biomes) and 0 <= cx < len(biomes[0])) else 0
-    except Exception:
-        bid = 0
-    return BIOME_SKY_COLORS.get(bid, BIOME_SKY_COLORS[0])
+    # Explicit bounds checks instead of a try block; biomes is a (GRID_H, GRID_W) array once generated
+    bid = int(biomes[cy, cx]) if (biomes is not None and 0 <= cy < GRID_H and 0 <= cx < GRID_W) else 0
+    return _BIOME_SKY_TUPLES[bid] if bid < len(_BIOME_SKY_TUPLES) else _BIOME_SKY_TUPLES[0]
+
+
+# Board (top-down map) palette per biome id
+BIOME_BOARD_COLORS: Dict[int, Tuple[int,int,int]] = {
+    0: (135, 206, 235),  # sky blue for non-biome
+    1: (255, 179, 186),  # pastel red
+    2: (255, 223, 186),  # pastel orange
+    3: (255, 255, 186),  # pastel yellow
+    4: (186, 255, 201),  # pastel green
+    5: (186, 225, 255),  # pastel blue
+    6: (218, 186, 255),  # pastel purple
+}
+# Per-tile board colour, (GRID_H, GRID_W, 3) uint8: inverse-distance blend of the biome
+# centres' palette colours. Depends only on the generated map, so it is built once.
+biome_color_grid: np.ndarray | None = None
+
+
+def get_biome_color_grid() -> np.ndarray:
+    global biome_color_grid
+    if biome_color_grid is not None:
+        return biome_color_grid
+    default = BIOME_BOARD_COLORS[0]
+    lut = np.array([BIOME_BOARD_COLORS.get(i, default) for i in range(256)], dtype=np.uint8)
+    bids = biomes if biomes is not None else np.zeros((GRID_H, GRID_W), dtype=np.uint8)
+    out = lut[bids]
+    if biome_centers and biome_radius > 0:
+        yy, xx = np.ogrid[0:GRID_H, 0:GRID_W]
+        r2 = biome_radius * biome_radius
+        acc = np.zeros((GRID_H, GRID_W, 3), dtype=np.float64)
+        wt_sum = np.zeros((GRID_H, GRID_W), dtype=np.float64)
+        for (cx0, cy0, bid) in biome_centers:
+            d2 = (xx - cx0) ** 2 + (yy - cy0) ** 2
+            w = np.where(d2 <= r2, 1.0 / (1.0 + np.sqrt(d2)), 0.0)
+            acc += w[:, :, None] * np.array(BIOME_BOARD_COLORS.get(bid, default), dtype=np.float64)
+            wt_sum += w
+        hit = wt_sum > 0
+        out[hit] = (acc[hit] / wt_sum[hit, None]).astype(np.uint8)
+    biome_color_grid = out
+    return out
+
+
+def biome_sky_colour_bulk(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Vectorized biome_sky_colour_at: (N, 3) uint8 sky colours for cells (xs[i], ys[i])."""
+    xs = np.asarray(xs, dtype=np.intp)
+    ys = np.asarray(ys, dtype=np.intp)
+    inb = (xs >= 0) & (xs < GRID_W) & (ys >= 0) & (ys < GRID_H)
+    bid = np.zeros(xs.shape, dtype=np.intp)
+    if biomes is not None:
+        bid[inb] = biomes[ys[inb], xs[inb]]
+    bid[bid >= len(_BIOME_SKY_LUT)] = 0
+    return _BIOME_SKY_LUT[bid]
 
 
 def init_grid_once():
@@ -769,7 +1267,7 @@ def init_grid_once():
     except Exception:
         pass
     # Start all walls
-    g = [[WALL for _ in range(GRID_W)] for _ in range(GRID_H)]
+    g = np.full((GRID_H, GRID_W), WALL, dtype=np.uint8)
     # Generate maze into g
     generate_maze(g, corridor_w=2, wall_w=1, room_prob=0.08)
     # Add rectangular rooms with doors before finalizing grid
@@ -811,37 +1309,35 @@ def init_grid_once():
     # Build wall type id grid and wall hp grid
     # For now all walls are default_type
     # Later we can vary by biome/region
-    wall_hp = [[((_hp_max_for_type(default_type)) if grid[y][x] == WALL else 0) for x in range(GRID_W)] for y in range(GRID_H)]
-    wall_type_id = [[(default_type if grid[y][x] == WALL else '') for x in range(GRID_W)] for y in range(GRID_H)]
+    is_wall = grid == WALL
+    wall_hp = np.where(is_wall, _hp_max_for_type(default_type), 0).astype(np.int32)
+    # Type ids are built as an object array so edges are assigned by slice, then handed out
+    # as the list-of-lists (wall_type_id[y][x]) the rest of the module indexes
+    type_grid = np.where(is_wall, default_type, '').astype(object)
     # Override perimeter with indestructible outer wall type if available
     outer_type = 'outer_wall' if 'outer_wall' in wt_map else None
     if outer_type is not None:
         outer_hp = _hp_max_for_type(outer_type)
         # Top and bottom rows
-        y = 0
-        for x in range(GRID_W):
-            if grid[y][x] == WALL:
-                wall_type_id[y][x] = outer_type
-                wall_hp[y][x] = outer_hp
+        row_walls = is_wall[0]
+        wall_hp[0, row_walls] = outer_hp
+        type_grid[0, row_walls] = outer_type
     # Apply door wall types and HP for any doors placed
     door_type = 'door1' if 'door1' in wt_map else None
     if door_type and 'door1' in wt_map:
         d_hp = _hp_max_for_type(door_type)
         for (dx, dy) in door_coords:
-            if 0 <= dx < GRID_W and 0 <= dy < GRID_H and grid[dy][dx] == WALL:
-                wall_type_id[dy][dx] = door_type
-                wall_hp[dy][dx] = d_hp
-        y = GRID_H - 1
-        for x in range(GRID_W):
-            if grid[y][x] == WALL:
-                wall_type_id[y][x] = outer_type
-                wall_hp[y][x] = outer_hp
+            if 0 <= dx < GRID_W and 0 <= dy < GRID_H and grid[dy, dx] == WALL:
+                type_grid[dy, dx] = door_type
+                wall_hp[dy, dx] = d_hp
+        row_walls = is_wall[GRID_H - 1]
+        wall_hp[GRID_H - 1, row_walls] = outer_hp
+        type_grid[GRID_H - 1, row_walls] = outer_type
         # Left and right columns (excluding corners already set)
-        x = 0
-        for y in range(1, GRID_H - 1):
-            if grid[y][x] == WALL:
-                wall_type_id[y][x] = outer_type
-                wall_hp[y][x] = outer_hp
+        col_walls = is_wall[1:GRID_H - 1, 0]
+        wall_hp[1:GRID_H - 1, 0][col_walls] = outer_hp
+        type_grid[1:GRID_H - 1, 0][col_walls] = outer_type
+    wall_type_id = type_grid.tolist()
 
     # Connect passable components by inserting one door per disconnected region
     try:
@@ -861,7 +1357,7 @@ def init_grid_once():
     #     seed = None
     #     for y in range(sy0, sy1 + 1):
     #         for x in range(sx0, sx1 + 1):
-    #             if (grid[y][x] == EMPTY) or (wall_type_id[y][x] == 'door1'):
+    #             if (grid[y, x] == EMPTY) or (wall_type_id[y][x] == 'door1'):
     #                 seed = (x, y)
     #                 break
     #         if seed:
@@ -869,7 +1365,7 @@ def init_grid_once():
     #     if seed is None:
     #         for y in range(1, GRID_H - 1):
     #             for x in range(1, GRID_W - 1):
-    #                 if (grid[y][x] == EMPTY) or (wall_type_id[y][x] == 'door1'):
+    #                 if (grid[y, x] == EMPTY) or (wall_type_id[y][x] == 'door1'):
     #                     seed = (x, y)
     #                     break
     #             if seed:
@@ -879,7 +1375,7 @@ def init_grid_once():
     # except Exception:
     #     pass
 
-def generate_biomes() -> List[List[int]]:
+def generate_biomes() -> np.ndarray:
     """Create biome ids per tile (0..6). 0 = default. 1..6 = colored biomes.
     Places N centers and fills circular regions of configurable radius.
     """
@@ -890,7 +1386,7 @@ def generate_biomes() -> List[List[int]]:
         radius = int(bio_cfg.get('radius', 24))  # in tiles
     except Exception:
         count, radius = 6, 24
-    b = [[0 for _ in range(GRID_W)] for _ in range(GRID_H)]
+    b = np.zeros((GRID_H, GRID_W), dtype=np.uint8)
     centers: List[Tuple[int,int,int]] = []  # (x,y,id)
     # Big room radius (in tiles) carved at each biome center
     room_r = 12
@@ -935,31 +1431,25 @@ def generate_biomes() -> List[List[int]]:
             centers.append((cx, cy, shuffled_ids[idx - 1]))
             idx += 1
     # Carve large rooms at biome centers if entirely within interior
+    dy_r, dx_r = np.ogrid[-room_r:room_r + 1, -room_r:room_r + 1]
+    room_disc = dx_r * dx_r + dy_r * dy_r <= room_r2  # (2r+1, 2r+1) disc stamp
     for (cx, cy, _bid) in centers:
         if cx - room_r < 1 or cx + room_r > GRID_W - 2 or cy - room_r < 1 or cy + room_r > GRID_H - 2:
             continue  # would cross outer wall; skip
-        for y in range(cy - room_r, cy + room_r + 1):
-            row = grid[y]
-            dy = y - cy
-            for x in range(cx - room_r, cx + room_r + 1):
-                dx = x - cx
-                if dx*dx + dy*dy <= room_r2:
-                    row[x] = EMPTY
+        grid[cy - room_r:cy + room_r + 1, cx - room_r:cx + room_r + 1][room_disc] = EMPTY
 
     # Persist centers and radius for rendering time blending
     global biome_centers, biome_radius
     biome_centers = centers
     biome_radius = radius
     r2 = radius * radius
-    for y in range(1, GRID_H - 1):
-        for x in range(1, GRID_W - 1):
-            # assign the first circle that contains this tile; could also pick nearest
-            for (cx, cy, bid) in centers:
-                dx = x - cx
-                dy = y - cy
-                if dx*dx + dy*dy <= r2:
-                    b[y][x] = bid
-                    break
+    # assign the first circle that contains this tile; could also pick nearest
+    yy, xx = np.ogrid[:GRID_H, :GRID_W]
+    interior = np.zeros((GRID_H, GRID_W), dtype=bool)
+    interior[1:GRID_H - 1, 1:GRID_W - 1] = True
+    for (cx, cy, bid) in centers:
+        mask = ((xx - cx) ** 2 + (yy - cy) ** 2 <= r2) & interior & (b == 0)
+        b[mask] = bid
     return b
 
 
@@ -981,12 +1471,12 @@ def _connect_components_via_doors() -> int:
         return 0
 
     # Guards
-    if grid is None or not wall_type_id or not wall_hp:
+    if grid is None or not wall_type_id or wall_hp is None:
         return 0
 
     def is_passable(x: int, y: int) -> bool:
         try:
-            return (grid[y][x] == EMPTY) or (wall_type_id[y][x] == 'door1')
+            return (grid[y, x] == EMPTY) or (wall_type_id[y][x] == 'door1')
         except Exception:
             return False
 
@@ -1058,7 +1548,7 @@ def _connect_components_via_doors() -> int:
                 if not (0 <= nx < GRID_W and 0 <= ny < GRID_H):
                     continue
                 # candidate wall between (x,y) in comp and (bx,by) potentially in main
-                if grid[ny][nx] != WALL:
+                if grid[ny, nx] != WALL:
                     continue
                 # Avoid outer border walls
                 if nx == 0 or ny == 0 or nx == GRID_W - 1 or ny == GRID_H - 1:
@@ -1082,9 +1572,9 @@ def _connect_components_via_doors() -> int:
             continue
         seen.add((dx, dy))
         try:
-            if grid[dy][dx] == WALL:
+            if grid[dy, dx] == WALL:
                 wall_type_id[dy][dx] = 'door1'
-                wall_hp[dy][dx] = door_hp
+                wall_hp[dy, dx] = door_hp
                 added_doors += 1
         except Exception:
             continue
@@ -1107,13 +1597,13 @@ def _seal_all_but_spawn_component() -> int:
     from collections import deque
 
     # Guards
-    if grid is None or not wall_type_id or not wall_hp:
+    if grid is None or not wall_type_id or wall_hp is None:
         return 0
 
     # Build temp passable map: 1 if EMPTY; 0 otherwise (ignore doors)
     def _temp_passable(x: int, y: int) -> bool:
         try:
-            return grid[y][x] == EMPTY
+            return grid[y, x] == EMPTY
         except Exception:
             return False
 
@@ -1157,11 +1647,10 @@ def _seal_all_but_spawn_component() -> int:
             best_size = len(comp)
     keep = set(best or [])
     to_seal: List[Tuple[int,int]] = []
-    for y in range(1, GRID_H - 1):
-        row = grid[y]
-        for x in range(1, GRID_W - 1):
-            if row[x] == EMPTY and (x, y) not in keep:
-                to_seal.append((x, y))
+    ys, xs = np.nonzero(grid[1:GRID_H - 1, 1:GRID_W - 1] == EMPTY)
+    for y, x in zip((ys + 1).tolist(), (xs + 1).tolist()):
+        if (x, y) not in keep:
+            to_seal.append((x, y))
 
     if not to_seal:
         return 0
@@ -1183,11 +1672,12 @@ def _seal_all_but_spawn_component() -> int:
     sealed = 0
     for (x, y) in to_seal:
         try:
-            if grid[y][x] != EMPTY:
+            if grid[y, x] != EMPTY:
                 continue
-            grid[y][x] = WALL
+            grid[y, x] = WALL
+            _blk_set(x, y, BLK_WALL)
             wall_type_id[y][x] = default_type
-            wall_hp[y][x] = hp_default
+            wall_hp[y, x] = hp_default
             sealed += 1
         except Exception:
             continue
@@ -1206,7 +1696,7 @@ def _connect_inaccessible_areas(seed: Tuple[int, int]) -> None:
     def _is_passable(tx: int, ty: int) -> bool:
         if not (0 <= tx < GRID_W and 0 <= ty < GRID_H):
             return False
-        if grid[ty][tx] == EMPTY:
+        if grid[ty, tx] == EMPTY:
             return True
         try:
             return wall_type_id[ty][tx] == 'door1'
@@ -1298,7 +1788,7 @@ def _connect_inaccessible_areas(seed: Tuple[int, int]) -> None:
                 bx, by = x + 2*dx, y + 2*dy
                 if not (0 <= wx < GRID_W and 0 <= wy < GRID_H and 0 <= bx < GRID_W and 0 <= by < GRID_H):
                     continue
-                if grid[wy][wx] != WALL:
+                if grid[wy, wx] != WALL:
                     continue
                 # other side must be passable and already reachable
                 if not _is_passable(bx, by) or not seen[by][bx]:
@@ -1312,7 +1802,7 @@ def _connect_inaccessible_areas(seed: Tuple[int, int]) -> None:
                 # Convert this wall to a door
                 try:
                     wall_type_id[wy][wx] = door_type or wall_type_id[wy][wx]
-                    wall_hp[wy][wx] = door_hp
+                    wall_hp[wy, wx] = door_hp
                 except Exception:
                     pass
                 # Also mark as passable for subsequent connectivity expansion in this run
@@ -1365,19 +1855,16 @@ def init_entities_once():
     if chest_n > 0:
         ents.extend(chest_generator(chest_n))
     # Spawn one demon spawner at each biome center (treat as item entity)
+    ent_cells = set()
+    for e in ents:
+        pos = e.get('pos')
+        if pos:
+            ent_cells.add((int(pos[0]), int(pos[1])))
     for (cx, cy, bid) in (biome_centers or []):
         # Avoid conflicting with another entity at same integer cell
-        conflict = False
-        for e in ents:
-            pos = e.get('pos')
-            if not pos:
-                continue
-            ex, ey = int(pos[0]), int(pos[1])
-            if ex == cx and ey == cy:
-                conflict = True
-                break
-        if conflict:
+        if (cx, cy) in ent_cells:
             continue
+        ent_cells.add((cx, cy))
         ents.append({
             'type': 'item',
             'item_id': 'demon_spawn',
@@ -1396,27 +1883,69 @@ def init_entities_once():
     # Attach contents to any container items (e.g., chests) that were added
     for ent in ents:
         _attach_container_contents(ent)
+        if not ent.get('id'):
+            ent['id'] = _new_entity_id()
 
     world_entities = ents
     entities_inited = True
     rebuild_solid_cells()
 
 
+def _new_entity_id() -> str:
+    """Next 'w<n>' world entity id; every entity is given one where it is created."""
+    global _entity_id_seq
+    _entity_id_seq += 1
+    return f"w{_entity_id_seq}"
+
+
+def _index_entity(ent: Dict[str, Any]) -> None:
+    """Add one newly placed world entity to entity_cell_index, solid_cells and the blockers grid."""
+    pos = ent.get('pos') or ent.get('position')
+    if not pos or len(pos) < 2:
+        return
+    ex, ey = int(float(pos[0])), int(float(pos[1]))
+    if not (0 <= ex < GRID_W and 0 <= ey < GRID_H):
+        return
+    ck = (ey << CELL_SHIFT) | ex
+    entity_cell_index[ck] = ent.get('id')
+    # Treat items (including chests and spawners) as solid for movement
+    if (ent.get('type') or 'item') == 'item':
+        solid_cells.add(ck)
+        _blk_set(ex, ey, BLK_SOLID)
+    # The spawn reservoir drops solid cells lazily when it draws them
+
+
 def rebuild_solid_cells():
-    """Recompute the set of grid cells blocked by solid world entities."""
-    global solid_cells
+    """Recompute the set of grid cells blocked by solid world entities and the
+    cell -> entity id index from scratch."""
+    global solid_cells, entity_cell_index
     s = set()
+    idx: Dict[int, str] = {}
     for ent in world_entities:
-        # Treat items (including chests and spawners) as solid for movement
-        if (ent.get('type') or 'item') != 'item':
-            continue
         pos = ent.get('pos') or ent.get('position')
         if not pos or len(pos) < 2:
             continue
         ex, ey = int(float(pos[0])), int(float(pos[1]))
-        if 0 <= ex < GRID_W and 0 <= ey < GRID_H:
-            s.add((ex, ey))
+        if not (0 <= ex < GRID_W and 0 <= ey < GRID_H):
+            continue
+        ck = (ey << CELL_SHIFT) | ex
+        idx[ck] = ent.get('id')
+        # Treat items (including chests and spawners) as solid for movement
+        if (ent.get('type') or 'item') == 'item':
+            s.add(ck)
     solid_cells = s
+    entity_cell_index = idx
+    solid_keys = np.fromiter(s, dtype=np.int32, count=len(s))
+    blk = blockers
+    if blk is not None:
+        blk &= 0xFF ^ BLK_SOLID
+        blk.reshape(-1)[solid_keys] |= BLK_SOLID
+    # Drop newly solid cells from the spawn reservoir in one pass
+    global _empty_cell_pool, _empty_pool_n
+    if _empty_cell_pool is not None and s:
+        live = _empty_cell_pool[:_empty_pool_n]
+        _empty_cell_pool = live[~np.isin(live, solid_keys)]
+        _empty_pool_n = len(_empty_cell_pool)
 
 
 def backpack_capacity_for_player(pdata: Dict[str, Any]) -> float:
@@ -1459,23 +1988,16 @@ def drop_item_near(cx: int, cy: int, item_id: str):
         nx, ny = cx + dx, cy + dy
         if not (0 <= nx < GRID_W and 0 <= ny < GRID_H):
             continue
-        if grid[ny][nx] != EMPTY:
+        if grid[ny, nx] != EMPTY:
             continue
-        if (nx, ny) in occupied or (nx, ny) in solid_cells:
+        ck = cell_key(nx, ny)
+        if ck in occupied or ck in solid_cells:
             continue
         # Ensure no other entity at that integer cell
-        conflict = False
-        for ent in world_entities:
-            pos = ent.get('pos') or ent.get('position')
-            if not pos:
-                continue
-            ex, ey = int(float(pos[0])), int(float(pos[1]))
-            if ex == nx and ey == ny:
-                conflict = True
-                break
-        if conflict:
+        if ck in entity_cell_index:
             continue
-        world_entities.append({
+        ent = {
+            'id': _new_entity_id(),
             'type': 'item',
             'item_id': item_id,
             'pos': [float(nx) + 0.5, float(ny) + 0.5],
@@ -1486,8 +2008,9 @@ def drop_item_near(cx: int, cy: int, item_id: str):
                 'scale': 1.0,
                 'y_offset': 0,
             }
-        })
-        rebuild_solid_cells()
+        }
+        world_entities.append(ent)
+        _index_entity(ent)
         return True
     return False
 
@@ -1498,11 +2021,8 @@ def item_generator(count: int) -> List[Dict[str, Any]]:
     Filters out container-like entries with no allowed slots (e.g., chests).
     """
     items: List[Dict[str, Any]] = []
-    # Candidate item ids: those with allowed_slots
-    candidates = [
-        it_id for it_id, it in ITEM_DB.items()
-        if it and it.get('allowed_slots') and bool(it.get('active', True))
-    ]
+    # Candidate item ids: those with allowed_slots (cached until ITEM_DB changes)
+    candidates = spawnable_item_ids()
     if not candidates:
         return items
     for _ in range(max(0, count)):
@@ -1993,10 +2513,7 @@ def write_world_log_once() -> None:
 
 def carve_rect(g, x0, y0, x1, y1, val=EMPTY):
     # inclusive rect bounds
-    for y in range(max(0, y0), min(GRID_H, y1 + 1)):
-        row = g[y]
-        for x in range(max(0, x0), min(GRID_W, x1 + 1)):
-            row[x] = val
+    g[max(0, y0):min(GRID_H, y1 + 1), max(0, x0):min(GRID_W, x1 + 1)] = val
 
 
 def add_rooms(g, room_count: int, size: int = 9) -> List[Tuple[int, int]]:
@@ -2045,8 +2562,8 @@ def add_rooms(g, room_count: int, size: int = 9) -> List[Tuple[int, int]]:
         room_doors: List[Tuple[int, int]] = []
         for (dx, dy) in picks:
             # Ensure ring at door position is a wall
-            if g[dy][dx] != WALL:
-                g[dy][dx] = WALL
+            if g[dy, dx] != WALL:
+                g[dy, dx] = WALL
             doors.append((dx, dy))
             room_doors.append((dx, dy))
             # Carve tunnel outward from the door (not through the door tile itself)
@@ -2056,28 +2573,28 @@ def add_rooms(g, room_count: int, size: int = 9) -> List[Tuple[int, int]]:
                 for t in range(tunnel_len):
                     ty = oy - t
                     if 1 <= ty < GRID_H - 1:
-                        g[ty][ox] = EMPTY
+                        g[ty, ox] = EMPTY
             elif dy == y1 and dx != x0 and dx != x1:
                 # bottom edge; outward is +y
                 ox, oy = dx, dy + 1
                 for t in range(tunnel_len):
                     ty = oy + t
                     if 1 <= ty < GRID_H - 1:
-                        g[ty][ox] = EMPTY
+                        g[ty, ox] = EMPTY
             elif dx == x0 and dy != y0 and dy != y1:
                 # left edge; outward is -x
                 ox, oy = dx - 1, dy
                 for t in range(tunnel_len):
                     tx = ox - t
                     if 1 <= tx < GRID_W - 1:
-                        g[oy][tx] = EMPTY
+                        g[oy, tx] = EMPTY
             elif dx == x1 and dy != y0 and dy != y1:
                 # right edge; outward is +x
                 ox, oy = dx + 1, dy
                 for t in range(tunnel_len):
                     tx = ox + t
                     if 1 <= tx < GRID_W - 1:
-                        g[oy][tx] = EMPTY
+                        g[oy, tx] = EMPTY
         # Persist room metadata for logs
         ROOMS.append({
             'rect': [x0, y0, x1, y1],
@@ -2109,9 +2626,11 @@ def generate_maze(g, corridor_w=3, wall_w=1, room_prob=0.08):
         by = 1 + j * stride
         return bx, by
 
+    # Macro cells and the walls between them always lie inside the outer
+    # wall, so the carves below are plain slice stores without clamping.
     def carve_cell(i, j):
         bx, by = cell_base(i, j)
-        carve_rect(g, bx, by, bx + cw - 1, by + cw - 1, EMPTY)
+        g[by:by + cw, bx:bx + cw] = EMPTY
 
     def open_between(i1, j1, i2, j2):
         # Open the separating 1-tile wall fully across corridor width
@@ -2119,22 +2638,22 @@ def generate_maze(g, corridor_w=3, wall_w=1, room_prob=0.08):
         bx2, by2 = cell_base(i2, j2)
         if i2 == i1 + 1 and j2 == j1:  # open vertical wall to the right
             wx = bx1 + cw  # wall column between
-            carve_rect(g, wx, by1, wx, by1 + cw - 1, EMPTY)
+            g[by1:by1 + cw, wx] = EMPTY
         elif i2 == i1 - 1 and j2 == j1:  # to the left
             wx = bx2 + cw
-            carve_rect(g, wx, by2, wx, by2 + cw - 1, EMPTY)
+            g[by2:by2 + cw, wx] = EMPTY
         elif j2 == j1 + 1 and i2 == i1:  # down
             wy = by1 + cw  # wall row between
-            carve_rect(g, bx1, wy, bx1 + cw - 1, wy, EMPTY)
+            g[wy, bx1:bx1 + cw] = EMPTY
         elif j2 == j1 - 1 and i2 == i1:  # up
             wy = by2 + cw
-            carve_rect(g, bx2, wy, bx2 + cw - 1, wy, EMPTY)
+            g[wy, bx2:bx2 + cw] = EMPTY
 
-    visited = [[False for _ in range(MW)] for _ in range(MH)]
+    visited = np.zeros((MH, MW), dtype=bool)
 
     # Random starting cell
     stack = [(random.randrange(MW), random.randrange(MH))]
-    visited[stack[0][1]][stack[0][0]] = True
+    visited[stack[0][1], stack[0][0]] = True
     carve_cell(stack[0][0], stack[0][1])
 
     def neighbors(i, j):
@@ -2160,23 +2679,23 @@ def generate_maze(g, corridor_w=3, wall_w=1, room_prob=0.08):
             for dj in range(rh):
                 for di in range(rw):
                     ii, jj = i + di, j + dj
-                    if 0 <= ii < MW and 0 <= jj < MH and not visited[jj][ii]:
+                    if 0 <= ii < MW and 0 <= jj < MH and not visited[jj, ii]:
                         open_between(i, j, ii, jj)
                         carve_cell(ii, jj)
-                        visited[jj][ii] = True
+                        visited[jj, ii] = True
                         stack.append((ii, jj))
             # continue DFS from the latest addition
             continue
 
         # Normal DFS step
-        unv = [(ii, jj) for (ii, jj) in neighbors(i, j) if not visited[jj][ii]]
+        unv = [(ii, jj) for (ii, jj) in neighbors(i, j) if not visited[jj, ii]]
         if not unv:
             stack.pop()
             continue
         ni, nj = random.choice(unv)
         open_between(i, j, ni, nj)
         carve_cell(ni, nj)
-        visited[nj][ni] = True
+        visited[nj, ni] = True
         stack.append((ni, nj))
 
 
@@ -2187,19 +2706,47 @@ def cell_to_px(cx: int, cy: int) -> Tuple[int, int]:
     )
 
 
+def _build_empty_cell_pool() -> None:
+    """Collect every EMPTY interior cell not blocked by a solid entity."""
+    global _empty_cell_pool, _empty_pool_n
+    ys, xs = np.nonzero(grid[1:GRID_H - 1, 1:GRID_W - 1] == EMPTY)
+    keys = (((ys + 1) << CELL_SHIFT) | (xs + 1)).astype(np.int32)
+    if solid_cells:
+        solid_keys = np.fromiter(solid_cells, dtype=np.int32, count=len(solid_cells))
+        keys = keys[~np.isin(keys, solid_keys)]
+    _empty_cell_pool = keys
+    _empty_pool_n = len(keys)
+
+
 def random_empty_cell() -> Tuple[int, int]:
-    # Avoid walls by choosing from interior [1..GRID_W-2], [1..GRID_H-2]
-    # Try a bounded number of attempts
-    for _ in range(500):
-        cx = random.randrange(1, GRID_W - 1)
-        cy = random.randrange(1, GRID_H - 1)
-        if grid[cy][cx] == EMPTY and (cx, cy) not in occupied and (cx, cy) not in solid_cells:
+    """Pick a random free interior cell. Cells handed out are removed from the
+    reservoir so repeated spawns never stack on the same tile."""
+    global _empty_pool_n
+    if _empty_cell_pool is None:
+        _build_empty_cell_pool()
+    pool = _empty_cell_pool
+    for _ in range(64):
+        n = _empty_pool_n
+        if n <= 0:
+            break
+        i = random.randrange(n)
+        key = int(pool[i])
+        cx, cy = key & CELL_MASK, key >> CELL_SHIFT
+        blocked = grid[cy, cx] != EMPTY or key in solid_cells
+        if not blocked and key in occupied:
+            continue  # a player is standing there; leave it in the pool
+        # Swap-remove: either we hand it out, or it was walled/blocked since the pool was built
+        n -= 1
+        pool[i] = pool[n]
+        _empty_pool_n = n
+        if not blocked:
+            return (cx, cy)
+    # Fallback linear scan if random attempts fail (row-major over interior EMPTY tiles)
+    ys, xs = np.nonzero(grid[1:GRID_H - 1, 1:GRID_W - 1] == EMPTY)
+    for cy, cx in zip((ys + 1).tolist(), (xs + 1).tolist()):
+        k = (cy << CELL_SHIFT) | cx
+        if k not in occupied and k not in solid_cells:
             return (cx, cy)
-    # Fallback linear scan if random attempts fail
-    for cy in range(1, GRID_H - 1):
-        for cx in range(1, GRID_W - 1):
-            if grid[cy][cx] == EMPTY and (cx, cy) not in occupied and (cx, cy) not in solid_cells:
-                return (cx, cy)
     # If full, place at a safe default
     return (1, 1)
 
@@ -2212,24 +2759,17 @@ def place_chest_next_to(cx: int, cy: int):
         nx, ny = cx + dx, cy + dy
         if not (0 <= nx < GRID_W and 0 <= ny < GRID_H):
             continue
-        if grid[ny][nx] != EMPTY:
+        if grid[ny, nx] != EMPTY:
             continue
-        if (nx, ny) in occupied or (nx, ny) in solid_cells:
+        ck = cell_key(nx, ny)
+        if ck in occupied or ck in solid_cells:
             continue
         # Avoid overlapping existing entity at same cell (integer check)
-        conflict = False
-        for ent in world_entities:
-            pos = ent.get('pos') or ent.get('position')
-            if not pos or len(pos) < 2:
-                continue
-            ex, ey = int(pos[0]), int(pos[1])
-            if ex == nx and ey == ny:
-                conflict = True
-                break
-        if conflict:
+        if ck in entity_cell_index:
             continue
         # Place chest entity
         ent = {
+            'id': _new_entity_id(),
             'type': 'item',
             'item_id': 'chest_basic',
             'pos': [float(nx) + 0.5, float(ny) + 0.5],
@@ -2243,7 +2783,7 @@ def place_chest_next_to(cx: int, cy: int):
         }
         _attach_container_contents(ent)
         world_entities.append(ent)
-        rebuild_solid_cells()
+        _index_entity(ent)
         return
 
 
@@ -2276,21 +2816,13 @@ def place_pillar_next_to(cx: int, cy: int, welcome: bool = False):
         nx, ny = cx + dx, cy + dy
         if not (0 <= nx < GRID_W and 0 <= ny < GRID_H):
             continue
-        if grid[ny][nx] != EMPTY:
+        if grid[ny, nx] != EMPTY:
             continue
-        if (nx, ny) in occupied or (nx, ny) in solid_cells:
+        ck = cell_key(nx, ny)
+        if ck in occupied or ck in solid_cells:
             continue
         # Avoid overlapping existing entity at same integer cell
-        conflict = False
-        for ent in world_entities:
-            pos = ent.get('pos') or ent.get('position')
-            if not pos or len(pos) < 2:
-                continue
-            ex, ey = int(float(pos[0])), int(float(pos[1]))
-            if ex == nx and ey == ny:
-                conflict = True
-                break
-        if conflict:
+        if ck in entity_cell_index:
             continue
         # Determine a pillar type and optional scroll content
         pillar_type = _pillar_type_for_element('')
@@ -2320,6 +2852,7 @@ def place_pillar_next_to(cx: int, cy: int, welcome: bool = False):
             except Exception:
                 pass
         ent = {
+            'id': _new_entity_id(),
             'type': 'item',
             'item_id': pillar_type,
             'pos': [float(nx) + 0.5, float(ny) + 0.5],
@@ -2334,7 +2867,7 @@ def place_pillar_next_to(cx: int, cy: int, welcome: bool = False):
             }
         }
         world_entities.append(ent)
-        rebuild_solid_cells()
+        _index_entity(ent)
         # Mark one-time start pillar placement if this was the welcome pillar
         if welcome:
             global START_PILLAR_PLACED
@@ -2369,23 +2902,19 @@ def maybe_spawn_test_items_near_start(cx: int, cy: int) -> None:
     def empty_and_valid(tx: int, ty: int) -> bool:
         if not (0 <= tx < GRID_W and 0 <= ty < GRID_H):
             return False
-        if grid[ty][tx] != EMPTY:
+        if grid[ty, tx] != EMPTY:
             return False
-        if (tx, ty) in occupied or (tx, ty) in solid_cells:
+        ck = cell_key(tx, ty)
+        if ck in occupied or ck in solid_cells:
+            return False
+        if ck in entity_cell_index:
             return False
-        for ent in world_entities:
-            pos = ent.get('pos') or ent.get('position')
-            if not pos or len(pos) < 2:
-                continue
-            ex, ey = int(float(pos[0])), int(float(pos[1]))
-            if ex == tx and ey == ty:
-                return False
         return True
 
     def adj_to_wall(tx: int, ty: int) -> bool:
         for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
             nx, ny = tx + dx, ty + dy
-            if 0 <= nx < GRID_W and 0 <= ny < GRID_H and grid[ny][nx] == WALL:
+            if 0 <= nx < GRID_W and 0 <= ny < GRID_H and grid[ny, nx] == WALL:
                 return True
         return False
 
@@ -2416,6 +2945,7 @@ def maybe_spawn_test_items_near_start(cx: int, cy: int) -> None:
                         continue
             # Spawn entity
             ent = {
+                'id': _new_entity_id(),
                 'type': 'item',
                 'item_id': item_id,
                 'pos': [float(tx) + 0.5, float(ty) + 0.5],
@@ -2428,39 +2958,187 @@ def maybe_spawn_test_items_near_start(cx: int, cy: int) -> None:
                 }
             }
             world_entities.append(ent)
+            # Index it so the next placement sees this one
+            _index_entity(ent)
             placed_for_d += 1
             spawned_any = True
     if spawned_any:
-        rebuild_solid_cells()
         TEST_ITEMS_SPAWNED = True
 
 
-def tick_enemies():
+_BLK_CLEAR_ENEMY = 0xFF ^ BLK_ENEMY
+
+# 8-neighbour step table shared by both enemy tick paths
+_ENEMY_STEP_DX = np.array([-1, 0, 1, -1, 1, -1, 0, 1], dtype=np.int8)
+_ENEMY_STEP_DY = np.array([-1, -1, -1, 0, 0, 1, 1, 1], dtype=np.int8)
+_ENEMY_DIRS: Tuple[Tuple[int, int], ...] = tuple(zip(_ENEMY_STEP_DX.tolist(), _ENEMY_STEP_DY.tolist()))
+# Prebuilt shuffles of the 8 directions; a blocked enemy picks one by index instead of
+# shuffling a fresh list. Fixed seed keeps the table stable; the pick uses `random`.
+_DIR_PERM_COUNT = 64
+_DIR_PERM_IDX = np.random.default_rng(8).permuted(
+    np.tile(np.arange(8, dtype=np.int8), (_DIR_PERM_COUNT, 1)), axis=1)
+_DIR_PERMS: Tuple[Tuple[Tuple[int, int], ...], ...] = tuple(
+    tuple(_ENEMY_DIRS[k] for k in row) for row in _DIR_PERM_IDX.tolist()
+)
+
+if njit is not None:
+    @njit(cache=True)
+    def _tick_enemies_kernel(blk, pos_x, pos_y, dir_x, dir_y, interval, next_ts, now, moved, perms):
+        h, w = blk.shape
+        n_perms = perms.shape[0]
+        for i in range(pos_x.shape[0]):
+            moved[i] = 0
+            if interval[i] <= 0.0 or now < next_ts[i]:
+                continue
+            cx = pos_x[i]
+            cy = pos_y[i]
+            dx = dir_x[i]
+            dy = dir_y[i]
+            nx = cx + dx
+            ny = cy + dy
+            ok = False
+            # First try continuing in the current direction
+            if (dx != 0 or dy != 0) and 0 <= nx < w and 0 <= ny < h:
+                ok = blk[ny, nx] == 0
+            if not ok:
+                # Random order over the 8 neighbours from the prebuilt table
+                order = perms[np.random.randint(0, n_perms)]
+                for k in range(8):
+                    d = order[k]
+                    tx = cx + _ENEMY_STEP_DX[d]
+                    ty = cy + _ENEMY_STEP_DY[d]
+                    if 0 <= tx < w and 0 <= ty < h and blk[ty, tx] == 0:
+                        dir_x[i] = _ENEMY_STEP_DX[d]
+                        dir_y[i] = _ENEMY_STEP_DY[d]
+                        nx = tx
+                        ny = ty
+                        ok = True
+                        break
+            if ok:
+                blk[cy, cx] = blk[cy, cx] & _BLK_CLEAR_ENEMY
+                blk[ny, nx] = blk[ny, nx] | BLK_ENEMY
+                pos_x[i] = nx
+                pos_y[i] = ny
+                moved[i] = 1
+            # Schedule next move regardless
+            next_ts[i] = now + interval[i]
+else:
+    _tick_enemies_kernel = None
+
+# Enemy state as parallel arrays for the JIT tick; rebuilt when enemy_rev changes.
+# The arrays own next_ts/dir while the kernel path is active; dicts get pos/dir/next_move_ts
+# of movers each tick, and every row is flushed back before a rebuild.
+_enemy_soa: Dict[str, Any] = {}
+
+
+def _enemy_soa_sync() -> Dict[str, Any]:
+    global _enemy_soa
+    if _enemy_soa.get('rev') == enemy_rev:
+        return _enemy_soa
+    if _enemy_soa:
+        # Keep schedules and headings of enemies that were rescheduled but did not move
+        next_ts, dir_x, dir_y = _enemy_soa['next_ts'], _enemy_soa['dir_x'], _enemy_soa['dir_y']
+        for i, ent in enumerate(_enemy_soa['ents']):
+            ent['next_move_ts'] = float(next_ts[i])
+            ent['dir'] = [int(dir_x[i]), int(dir_y[i])]
+    ents = []
+    for ent in enemies.values():
+        pos = ent.get('pos')
+        if pos and len(pos) >= 2:
+            ents.append(ent)
+    n = len(ents)
+    pos_x = np.empty(n, dtype=np.int16)
+    pos_y = np.empty(n, dtype=np.int16)
+    dir_x = np.zeros(n, dtype=np.int8)
+    dir_y = np.zeros(n, dtype=np.int8)
+    interval = np.zeros(n, dtype=np.float64)
+    # float64: epoch seconds need more precision than float32 offers
+    next_ts = np.zeros(n, dtype=np.float64)
+    for i, ent in enumerate(ents):
+        pos_x[i] = int(ent['pos'][0])
+        pos_y[i] = int(ent['pos'][1])
+        d = ent.get('dir')
+        if isinstance(d, (list, tuple)) and len(d) == 2:
+            try:
+                dir_x[i], dir_y[i] = int(d[0]), int(d[1])
+            except Exception:
+                pass
+        interval[i] = ent.get('interval') or 0.0
+        next_ts[i] = float(ent.get('next_move_ts') or 0.0)
+    _enemy_soa = {
+        'rev': enemy_rev, 'ents': ents,
+        'pos_x': pos_x, 'pos_y': pos_y, 'dir_x': dir_x, 'dir_y': dir_y,
+        'interval': interval, 'next_ts': next_ts, 'moved': np.zeros(n, dtype=np.uint8),
+    }
+    return _enemy_soa
+
+
+def _tick_enemies_jit(now: float) -> List[Tuple[str, float, float]]:
+    soa = _enemy_soa_sync()
+    pos_x, pos_y = soa['pos_x'], soa['pos_y']
+    moved = soa['moved']
+    # The kernel moves the BLK_ENEMY bits in place
+    _tick_enemies_kernel(get_blockers(), pos_x, pos_y, soa['dir_x'], soa['dir_y'],
+                         soa['interval'], soa['next_ts'], now, moved, _DIR_PERM_IDX)
+    # Sync back only the enemies that actually moved
+    ents = soa['ents']
+    moves: List[Tuple[str, float, float]] = []
+    for i in np.flatnonzero(moved).tolist():
+        ent = ents[i]
+        ocx, ocy = int(ent['pos'][0]), int(ent['pos'][1])
+        nx, ny = int(pos_x[i]), int(pos_y[i])
+        ent['pos'] = [float(nx) + 0.5, float(ny) + 0.5]
+        ent['dir'] = [int(soa['dir_x'][i]), int(soa['dir_y'][i])]
+        ent['next_move_ts'] = float(soa['next_ts'][i])
+        eid = ent['id']
+        ock = cell_key(ocx, ocy)
+        if enemy_cell_index.get(ock) == eid:
+            del enemy_cell_index[ock]
+        enemy_cell_index[cell_key(nx, ny)] = eid
+        moves.append((eid, float(nx) + 0.5, float(ny) + 0.5))
+    return moves
+
+
+# enemies.move flag, re-read only when the config is reloaded
+_move_enabled: bool = True
+_move_enabled_gen: int = -1
+
+
+def _enemy_move_enabled() -> bool:
+    global _move_enabled, _move_enabled_gen
+    gen = game_config.config_generation()
+    if gen != _move_enabled_gen:
+        try:
+            _move_enabled = bool(((game_config.get_game_config() or {}).get('enemies') or {}).get('move', True))
+        except Exception:
+            _move_enabled = True
+        _move_enabled_gen = gen
+    return _move_enabled
+
+
+def tick_enemies() -> List[Tuple[str, float, float]]:
     """Basic timed random movement per enemy based on speed stat.
     speed 0 => no movement. speed 1 => ~3s per move. speed 256 => ~1s per move.
+    Runs as a compiled SoA kernel when numba is available.
+    Returns this tick's moves as (enemy_id, x, y) so callers can publish them in one batch.
     """
+    moves: List[Tuple[str, float, float]] = []
     if not enemies:
-        return
+        return moves
     # Respect config toggle
-    try:
-        move_enabled = bool(((game_config.get_game_config() or {}).get('enemies') or {}).get('move', True))
-    except Exception:
-        move_enabled = True
-    if not move_enabled:
-        return
+    if not _enemy_move_enabled():
+        return moves
     now = time.time()
-    # Precompute occupancy to avoid overlaps
-    e_occ = enemy_occupied_cells()
+    if _tick_enemies_kernel is not None:
+        return _tick_enemies_jit(now)
+    # Live enemy occupancy index and blocker grid; moves below keep both current
+    e_occ = enemy_cell_index
+    blk = get_blockers()
     for eid, ent in enemies.items():
-        try:
-            speed = int(ent.get('speed', 0))
-        except Exception:
-            speed = 0
-        if speed <= 0:
+        # Precomputed in make_enemy_instance; None for speed 0
+        interval = ent.get('interval')
+        if not interval:
             continue
-        # Interval mapping: linear from 3.0s at 1 to 1.0s at 256
-        s = clamp(speed, 1, 256)
-        interval = 3.0 - 2.0 * ((s - 1) / (256 - 1))
         nxt = float(ent.get('next_move_ts') or 0.0)
         if now < nxt:
             continue
@@ -2470,17 +3148,7 @@ def tick_enemies():
         cx, cy = int(pos[0]), int(pos[1])
         # Helper to test passability
         def passable(tx: int, ty: int) -> bool:
-            if not (0 <= tx < GRID_W and 0 <= ty < GRID_H):
-                return False
-            if grid[ty][tx] != EMPTY:
-                return False
-            if (tx, ty) in occupied:
-                return False
-            if (tx, ty) in solid_cells:
-                return False
-            if (tx, ty) in e_occ:
-                return False
-            return True
+            return 0 <= tx < GRID_W and 0 <= ty < GRID_H and blk[ty, tx] == 0
 
         # First try continuing in the current direction
         dx, dy = 0, 0
@@ -2495,25 +3163,30 @@ def tick_enemies():
         if not (dx == 0 and dy == 0) and passable(nx, ny):
             # Continue moving in same direction
             ent['pos'] = [float(nx) + 0.5, float(ny) + 0.5]
-            e_occ.pop((cx, cy), None)
-            e_occ[(nx, ny)] = eid
+            e_occ.pop(cell_key(cx, cy), None)
+            e_occ[cell_key(nx, ny)] = eid
+            blk[cy, cx] &= _BLK_CLEAR_ENEMY
+            blk[ny, nx] |= BLK_ENEMY
+            moves.append((eid, float(nx) + 0.5, float(ny) + 0.5))
             moved = True
         else:
             # Choose a new random valid direction
-            dirs = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if not (dx == 0 and dy == 0)]
-            random.shuffle(dirs)
-            for ndx, ndy in dirs:
+            for ndx, ndy in _DIR_PERMS[random.randrange(_DIR_PERM_COUNT)]:
                 tx, ty = cx + ndx, cy + ndy
                 if passable(tx, ty):
                     ent['dir'] = [ndx, ndy]
                     ent['pos'] = [float(tx) + 0.5, float(ty) + 0.5]
-                    e_occ.pop((cx, cy), None)
-                    e_occ[(tx, ty)] = eid
+                    e_occ.pop(cell_key(cx, cy), None)
+                    e_occ[cell_key(tx, ty)] = eid
+                    blk[cy, cx] &= _BLK_CLEAR_ENEMY
+                    blk[ty, tx] |= BLK_ENEMY
+                    moves.append((eid, float(tx) + 0.5, float(ty) + 0.5))
                     moved = True
                     break
             # If no valid move, keep direction and stay in place
         # Schedule next move regardless
         ent['next_move_ts'] = now + interval
+    return moves
 
 
 def ensure_player(sid: str):
@@ -2534,13 +3207,19 @@ def ensure_player(sid: str):
                 tx, ty = int(rc[0]), int(rc[1])
                 # Validate passability of the restored cell
                 if 0 <= tx < GRID_W and 0 <= ty < GRID_H:
-                    if grid[ty][tx] == EMPTY and (tx, ty) not in occupied and (tx, ty) not in solid_cells:
+                    ck = cell_key(tx, ty)
+                    if grid[ty, tx] == EMPTY and ck not in occupied and ck not in solid_cells:
                         restore_cell = (tx, ty)
             if isinstance(ra, (int, float)):
                 restore_angle = float(ra)
-            # Validate seen mask dimensions if provided
-            if isinstance(rs, list) and len(rs) == GRID_H and all(isinstance(row, list) and len(row) == GRID_W for row in rs):
-                restore_seen = rs
+            # Validate seen mask dimensions if provided (packed bits, ndarray, or list-of-lists from older profiles)
+            if isinstance(rs, bytes) and tuple(r.get('seen_shape') or ()) == (GRID_H, GRID_W):
+                bits = np.unpackbits(np.frombuffer(rs, dtype=np.uint8), count=GRID_H * GRID_W)
+                restore_seen = bits.reshape(GRID_H, GRID_W).astype(bool)
+            elif isinstance(rs, np.ndarray) and rs.shape == (GRID_H, GRID_W):
+                restore_seen = rs.astype(bool)
+            elif isinstance(rs, list) and len(rs) == GRID_H and all(isinstance(row, list) and len(row) == GRID_W for row in rs):
+                restore_seen = np.array(rs, dtype=bool)
         except Exception:
             restore_cell = None
             restore_angle = None
@@ -2561,7 +3240,8 @@ def ensure_player(sid: str):
             chosen = None
             for k in range(n):
                 cx_try, cy_try = candidates[(start_idx + k) % n]
-                if grid[cy_try][cx_try] == EMPTY and (cx_try, cy_try) not in occupied and (cx_try, cy_try) not in solid_cells:
+                ck = cell_key(cx_try, cy_try)
+                if grid[cy_try, cx_try] == EMPTY and ck not in occupied and ck not in solid_cells:
                     chosen = (cx_try, cy_try)
                     break
             if chosen is None:
@@ -2570,7 +3250,8 @@ def ensure_player(sid: str):
                 cx, cy = chosen
         else:
             cx, cy = restore_cell
-        occupied[(cx, cy)] = sid
+        occupied[cell_key(cx, cy)] = sid
+        _blk_set(cx, cy, BLK_PLAYER)
         px, py = cell_to_px(cx, cy)
         # Default facing is down (90 deg) unless a restore angle exists
         ang = restore_angle if restore_angle is not None else math.radians(90)
@@ -2591,17 +3272,11 @@ def ensure_player(sid: str):
         except Exception:
             mode, reveal_r = 'full', 6
         # Prefer restored seen if available and valid
-        seen = restore_seen if restore_seen is not None else [[False for _ in range(GRID_W)] for _ in range(GRID_H)]
+        seen = restore_seen if restore_seen is not None else np.zeros((GRID_H, GRID_W), dtype=bool)
         player_state[sid]['seen'] = seen
         if mode in ('fog', 'reveal'):
             # reveal around spawn
-            r2 = reveal_r * reveal_r
-            for yy in range(max(0, cy - reveal_r), min(GRID_H, cy + reveal_r + 1)):
-                dy = yy - cy
-                for xx in range(max(0, cx - reveal_r), min(GRID_W, cx + reveal_r + 1)):
-                    dx = xx - cx
-                    if dx*dx + dy*dy <= r2:
-                        seen[yy][xx] = True
+            reveal_around(seen, cx, cy, reveal_r)
         # Also drop a chest adjacent to the player's spawn for NEW spawns only
         # Do not respawn a chest if we are restoring a returning player
         # Chest spawning next to new spawns was for testing only and is now disabled
@@ -2631,6 +3306,284 @@ def apply_command(pos: Tuple[int, int], cmd: str) -> Tuple[int, int]:
     return pos  # actual movement handled in run loop using cell state
 
 
+_TWO_PI = 2 * math.pi
+_QUARTERS_PER_RAD = 4 / _TWO_PI
+# Quarter-turn index -> facing name; angles grow clockwise on screen (y points down)
+_FACING_DIRS = ('right', 'down', 'left', 'up')
+
+
+def angle_to_dir(a: float) -> str:
+    """Map angle to nearest cardinal for the 4x4 white pixels indicator."""
+    return _FACING_DIRS[int((a % _TWO_PI) * _QUARTERS_PER_RAD + 0.5) & 3]
+
+
+def ray_directions(angle: float, cos_off: np.ndarray, sin_off: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit ray directions for a view angle, rotating the fixed per-column FOV offsets."""
+    ca = math.cos(angle)
+    sa = math.sin(angle)
+    return ca * cos_off - sa * sin_off, sa * cos_off + ca * sin_off
+
+
+def _raycast_columns(px, py, ray_dirs_x, ray_dirs_y, grid, wall_hp, biomes, n_rays, rc_h, max_dist,
+                     wall, hp_base, hp_per_biome, heights, shades, dists, hit_x, hit_y):
+    """DDA-cast n_rays columns along ray_dirs_x/y from (px, py) and fill the output buffers.
+    hit_x/hit_y get the wall cell each ray stopped on, or -1 when it left the map.
+    Runs compiled on ndarrays via _raycast_kernel, or as plain Python on list snapshots.
+    """
+    # Locals for the DDA bounds check: the Python fallback pays a dict lookup per global
+    grid_w = GRID_W
+    grid_h = GRID_H
+    # Column height numerator (boosted 1.5x), invariant across rays
+    col_scale = 1.5 * rc_h
+    # Rays only write their own slot r, so the compiled kernel splits them across cores
+    for r in prange(n_rays):
+        ray_dir_x = ray_dirs_x[r]
+        ray_dir_y = ray_dirs_y[r]
+
+        map_x = int(px)
+        map_y = int(py)
+
+        delta_dist_x = abs(1.0 / ray_dir_x) if ray_dir_x != 0 else 1e9
+        delta_dist_y = abs(1.0 / ray_dir_y) if ray_dir_y != 0 else 1e9
+
+        if ray_dir_x < 0:
+            step_x = -1
+            side_dist_x = (px - map_x) * delta_dist_x
+        else:
+            step_x = 1
+            side_dist_x = (map_x + 1.0 - px) * delta_dist_x
+        if ray_dir_y < 0:
+            step_y = -1
+            side_dist_y = (py - map_y) * delta_dist_y
+        else:
+            step_y = 1
+            side_dist_y = (map_y + 1.0 - py) * delta_dist_y
+
+        hit = 0
+        side = 0  # 0: x side, 1: y side
+        depth = 0.0
+        in_map = True
+        # DDA loop
+        while hit == 0 and depth < max_dist:
+            if side_dist_x < side_dist_y:
+                side_dist_x += delta_dist_x
+                map_x += step_x
+                side = 0
+            else:
+                side_dist_y += delta_dist_y
+                map_y += step_y
+                side = 1
+            if 0 <= map_x < grid_w and 0 <= map_y < grid_h:
+                if grid[map_y][map_x] == wall:
+                    hit = 1
+            else:
+                hit = 1  # out of bounds treated as wall
+                in_map = False
+
+        if side == 0:
+            perp_dist = (side_dist_x - delta_dist_x)
+        else:
+            perp_dist = (side_dist_y - delta_dist_y)
+
+        # Protect against zero
+        perp_dist = max(1e-4, perp_dist)
+
+        # Column height proportional to inverse distance; boosted 1.5x
+        col_h = int(col_scale / perp_dist)
+        col_h = max(1, min(rc_h, col_h))
+
+        # Distance shading (closer = brighter)
+        s = 1.0 / (1.0 + 0.08 * perp_dist)
+        if side == 1:
+            s *= 0.85  # darken for y-sides
+        s = max(0.15, min(1.0, s))
+
+        hit_x[r] = -1
+        hit_y[r] = -1
+        # Additional darkening to simulate cracks based on wall HP
+        if in_map and hit == 1:
+            hit_x[r] = map_x
+            hit_y[r] = map_y
+            hp = wall_hp[map_y][map_x]
+            # compute local max based on biome
+            max_loc = max(1, int(hp_base + hp_per_biome * biomes[map_y][map_x]))
+            frac = max(0.0, min(1.0, hp / float(max_loc)))
+            # Healthy -> 1.0; broken -> 0.6
+            s *= (0.6 + 0.4 * frac)
+
+        heights[r] = col_h
+        shades[r] = int(255 * s)
+        dists[r] = perp_dist
+
+
+_raycast_kernel = njit(parallel=True, cache=True, fastmath=True)(_raycast_columns) if njit is not None else None
+
+
+# Item billboards for the phone sprite pass; world_entities only grows, so its length keys the cache
+_item_sprite_soa: Dict[str, Any] = {}
+# Item billboards are bucketed into BILLBOARD_GRID_CELL-sized squares once there are more than BILLBOARD_GRID_MIN
+BILLBOARD_GRID_CELL = 8
+BILLBOARD_GRID_MIN = 64
+
+
+def _item_sprite_sync() -> Dict[str, Any]:
+    global _item_sprite_soa
+    if _item_sprite_soa.get('src') is world_entities and _item_sprite_soa.get('count') == len(world_entities):
+        return _item_sprite_soa
+    ents = []
+    for ent in world_entities:
+        if (ent.get('type') or 'item') != 'item':
+            continue
+        pos = ent.get('pos') or ent.get('position')
+        if pos and len(pos) >= 2:
+            ents.append(ent)
+    pos_arr = np.empty((len(ents), 2), dtype=np.float64)
+    for i, ent in enumerate(ents):
+        pos = ent.get('pos') or ent.get('position')
+        pos_arr[i, 0] = float(pos[0])
+        pos_arr[i, 1] = float(pos[1])
+    # Broad-phase buckets (coarse cell -> indices into ents), only worth building for crowded worlds
+    buckets = None
+    if len(ents) > BILLBOARD_GRID_MIN:
+        cell_lists: Dict[Tuple[int, int], List[int]] = {}
+        for i, key in enumerate(map(tuple, (pos_arr // BILLBOARD_GRID_CELL).astype(np.int64).tolist())):
+            cell_lists.setdefault(key, []).append(i)
+        buckets = {key: np.array(idx, dtype=np.intp) for key, idx in cell_lists.items()}
+    _item_sprite_soa = {'src': world_entities, 'count': len(world_entities), 'ents': ents, 'pos': pos_arr,
+                        'buckets': buckets}
+    return _item_sprite_soa
+
+
+def billboard_candidates(soa: Dict[str, Any], px: float, py: float, reach: float) -> Optional[np.ndarray]:
+    """Indices of SoA entries whose bucket overlaps the reach box around (px, py), ascending.
+    None when the SoA has no buckets (small worlds), meaning every entry is a candidate.
+    """
+    buckets = soa.get('buckets')
+    if buckets is None or not math.isfinite(reach):
+        return None
+    x0 = int((px - reach) // BILLBOARD_GRID_CELL)
+    x1 = int((px + reach) // BILLBOARD_GRID_CELL)
+    y0 = int((py - reach) // BILLBOARD_GRID_CELL)
+    y1 = int((py + reach) // BILLBOARD_GRID_CELL)
+    parts = [idx for (bx, by), idx in buckets.items() if x0 <= bx <= x1 and y0 <= by <= y1]
+    if len(parts) == len(buckets):
+        return None
+    if not parts:
+        return np.empty(0, dtype=np.intp)
+    cand = np.concatenate(parts)
+    cand.sort()
+    return cand
+
+
+def cull_billboards(pos: np.ndarray, px: float, py: float, angle: float, half_fov: float,
+                    reach: float = math.inf):
+    """Return (indices, dists, rel_angles) for the (N, 2) positions within half_fov (< pi/2) of angle
+    and no farther than reach. dists/rel_angles are aligned with indices; points on top of the viewer are dropped.
+    The cull is a dot-product cone test, so sqrt/atan2 only run for the survivors.
+    """
+    fwd_x = math.cos(angle)
+    fwd_y = math.sin(angle)
+    cos_lim2 = math.cos(half_fov) ** 2
+    dx = pos[:, 0] - px
+    dy = pos[:, 1] - py
+    d2 = dx * dx + dy * dy
+    dot = dx * fwd_x + dy * fwd_y
+    idx = np.flatnonzero((d2 > 1e-6) & (d2 <= reach * reach) & (dot > 0) & (dot * dot >= cos_lim2 * d2))
+    dx = dx[idx]
+    dy = dy[idx]
+    dot = dot[idx]
+    # Bearing in the view frame: signed angle from the forward vector
+    rel = np.arctan2(dy * fwd_x - dx * fwd_y, dot)
+    return idx, np.sqrt(d2[idx]), rel
+
+
+def billboard_columns(rels: np.ndarray, dists: np.ndarray, fov: float, n_rays: int, rc_h: int):
+    """Screen column centre and unscaled height (rc_h / dist) for culled billboards."""
+    ray_xs = ((rels + fov * 0.5) * ((n_rays - 1) / fov)).astype(np.intp)
+    np.clip(ray_xs, 0, n_rays - 1, out=ray_xs)
+    return ray_xs, rc_h / np.maximum(1e-3, dists)
+
+
+def _project_billboards_loop(pos, px, py, fwd_x, fwd_y, cos_lim2, reach2, fov, n_rays, rc_h, keep, dists, rays, bases):
+    """Scalar fusion of cull_billboards + billboard_columns for the numba kernel; returns the kept count."""
+    half_fov = fov * 0.5
+    ray_scale = (n_rays - 1) / fov
+    n = 0
+    for i in range(pos.shape[0]):
+        dx = pos[i, 0] - px
+        dy = pos[i, 1] - py
+        d2 = dx * dx + dy * dy
+        dot = dx * fwd_x + dy * fwd_y
+        if d2 <= 1e-6 or d2 > reach2 or dot <= 0.0 or dot * dot < cos_lim2 * d2:
+            continue
+        dist = math.sqrt(d2)
+        rel = math.atan2(dy * fwd_x - dx * fwd_y, dot)
+        ray = int((rel + half_fov) * ray_scale)
+        if ray < 0:
+            ray = 0
+        elif ray > n_rays - 1:
+            ray = n_rays - 1
+        keep[n] = i
+        dists[n] = dist
+        rays[n] = ray
+        bases[n] = rc_h / max(1e-3, dist)
+        n += 1
+    return n
+
+_project_billboards_kernel = njit(cache=True, fastmath=True)(_project_billboards_loop) if njit is not None else None
+
+
+def project_billboards(pos: np.ndarray, px: float, py: float, angle: float, half_fov: float,
+                       fov: float, n_rays: int, rc_h: int, reach: float = math.inf):
+    """Cull (N, 2) billboard positions to the view cone (out to reach) and project the survivors.
+    Returns aligned (indices, dists, screen columns, base heights); one fused compiled
+    pass when numba is available, otherwise the numpy cull + column passes.
+    """
+    if _project_billboards_kernel is not None:
+        n = pos.shape[0]
+        keep = np.empty(n, dtype=np.intp)
+        dists = np.empty(n, dtype=np.float64)
+        rays = np.empty(n, dtype=np.intp)
+        bases = np.empty(n, dtype=np.float64)
+        m = _project_billboards_kernel(pos, px, py, math.cos(angle), math.sin(angle), math.cos(half_fov) ** 2,
+                                       reach * reach, fov, n_rays, rc_h, keep, dists, rays, bases)
+        return keep[:m], dists[:m], rays[:m], bases[:m]
+    keep, dists, rels = cull_billboards(pos, px, py, angle, half_fov, reach)
+    rays, bases = billboard_columns(rels, dists, fov, n_rays, rc_h)
+    return keep, dists, rays, bases
+
+
+# Field order of the per-view sprite tuples, and the keys of the 'sprite_cols' frame payload
+SPRITE_FIELDS = ('depth', 'img', 'sx', 'sy', 'sw', 'sh', 'x', 'y', 'w', 'h', 'kind')
+_SPRITE_DEPTH = itemgetter(0)
+
+
+def sprite_columns(sprites: List[Tuple]) -> Tuple[Dict[str, list], List[str]]:
+    """Transpose sprite tuples into one list per SPRITE_FIELDS entry.
+    'img' and 'kind' become indices into the returned string palette; 'depth' is sent as
+    little-endian float16 bytes, the same precision as the wall dists it is tested against.
+    """
+    if not sprites:
+        cols = {f: [] for f in SPRITE_FIELDS}
+        cols['depth'] = b''
+        return cols, []
+    cols = dict(zip(SPRITE_FIELDS, map(list, zip(*sprites))))
+    cols['depth'] = np.asarray(cols['depth'], dtype='<f2').tobytes()
+    palette: Dict[str, int] = {}
+    cols['img'] = [palette.setdefault(v, len(palette)) for v in cols['img']]
+    cols['kind'] = [palette.setdefault(v, len(palette)) for v in cols['kind']]
+    return cols, list(palette)
+
+
+def pack_frame_columns(heights, shades, dists) -> bytes:
+    """Pack per-column raycast output into one little-endian blob for the 'frame' event.
+    Layout: n x uint16 heights, n x uint8 shades, n x float16 dists (decoded in controls.js).
+    """
+    return (np.asarray(heights).astype('<u2').tobytes()
+            + np.asarray(shades).astype(np.uint8).tobytes()
+            + np.asarray(dists).astype('<f2').tobytes())
+
+
 def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface):
     clock = pygame.time.Clock()
     font = pygame.font.SysFont(None, 26)
@@ -2640,9 +3593,23 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
     RC_NUM_RAYS = 400
     RC_W = RC_NUM_RAYS
     RC_H = 160
+    # Clamp bounds for billboard heights and screen columns
+    RC_H3 = 3 * RC_H
+    RC_RAYS_M1 = RC_NUM_RAYS - 1
+    RC_HALF_FOV = RC_FOV * 0.5
+    RC_INV_FOV = 1.0 / RC_FOV
+    # Billboard cull cone: FOV plus a 10 degree margin so sprites don't pop at the screen edge
+    SPRITE_HALF_FOV = RC_HALF_FOV + math.radians(10)
+    SPRITE_COS_LIM2 = math.cos(SPRITE_HALF_FOV) ** 2
     RC_MAX_DIST = math.hypot(GRID_W, GRID_H)
+    # Per-column angle offsets across the FOV are fixed; each cast only rotates them by the view angle
+    RC_RAY_OFFSETS = np.linspace(-RC_HALF_FOV, RC_HALF_FOV, RC_NUM_RAYS)
+    RC_COS_OFF = np.cos(RC_RAY_OFFSETS)
+    RC_SIN_OFF = np.sin(RC_RAY_OFFSETS)
     ROT_STEP = math.radians(45)  # target step per left/right command
     ROT_SPEED = math.radians(360)  # deg/sec for smooth rotation
+    # Bumped whenever a wall's HP or presence changes; keys the per-player column cache
+    rc_walls_rev = 0
 
     # Live tuning state (loaded from config, adjustable via UI)
     try:
@@ -2671,6 +3638,11 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
     ensure_knowledge_pillars_once()
     ensure_scrolls_generated_once()
     write_world_log_once()
+    # Decode enemy sprites up front, in parallel, rather than one by one on first use
+    try:
+        prewarm_enemy_sprites()
+    except Exception as e:
+        print(f"sprite prewarm failed: {e}")
 
     while running:
         # Events to allow clean quit
@@ -2723,17 +3695,26 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
         init_entities_once()
 
         # Remove local players that no longer exist on server
-        for sid in list(player_state.keys()):
-            if sid not in players:
-                # free occupied cell
-                cell = player_state[sid].get('cell')
-                if cell in occupied:
-                    occupied.pop(cell, None)
-                del player_state[sid]
+        for sid in player_state.keys() - players.keys():
+            # free occupied cell
+            cell = player_state[sid].get('cell')
+            if cell and cell_key(cell[0], cell[1]) in occupied:
+                occupied.pop(cell_key(cell[0], cell[1]), None)
+                _blk_clear(cell[0], cell[1], BLK_PLAYER)
+            del player_state[sid]
+        # One roster snapshot per frame (socket handlers add/remove players concurrently)
+        frame_players = list(players.items())
+
+        # Snapshot config sections once per frame; the sprite loops below reuse them
+        try:
+            frame_cfg = game_config.get_game_config() or {}
+            vis_cfg = frame_cfg.get('visibility') or {}
+            tuning_cfg = frame_cfg.get('tuning') or {}
+        except Exception:
+            vis_cfg, tuning_cfg = {}, {}
 
         # Compute combined visibility mask based on config
         try:
-            vis_cfg = (game_config.get_game_config() or {}).get('visibility') or {}
             vis_mode = str(vis_cfg.get('mode', 'full'))
             reveal_r = int(vis_cfg.get('reveal_radius', 6))
         except Exception:
@@ -2743,53 +3724,33 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
         # Treat 'reveal' as alias of 'fog' (persistent reveal on big map)
         if vis_mode in ('fog', 'reveal'):
             # Start all-false combined
-            visible_mask = [[False for _ in range(GRID_W)] for _ in range(GRID_H)]
-            r2 = reveal_r * reveal_r
-            for sid, pdata in list(players.items()):
+            visible_mask = np.zeros((GRID_H, GRID_W), dtype=bool)
+            for sid, pdata in frame_players:
                 st = player_state.get(sid)
                 if not st:
                     continue
                 cx, cy = st.get('cell', (0, 0))
                 # ensure seen exists
-                if 'seen' not in st or not st['seen']:
-                    st['seen'] = [[False for _ in range(GRID_W)] for _ in range(GRID_H)]
-                seen = st['seen']
+                if st.get('seen') is None:
+                    st['seen'] = np.zeros((GRID_H, GRID_W), dtype=bool)
                 # reveal around current cell
-                x0 = max(0, cx - reveal_r)
-                x1 = min(GRID_W - 1, cx + reveal_r)
-                y0 = max(0, cy - reveal_r)
-                y1 = min(GRID_H - 1, cy + reveal_r)
-                for yy in range(y0, y1 + 1):
-                    dy = yy - cy
-                    for xx in range(x0, x1 + 1):
-                        dx = xx - cx
-                        if dx*dx + dy*dy <= r2:
-                            seen[yy][xx] = True
+                reveal_around(st['seen'], cx, cy, reveal_r)
             # Build combined visibility from union of all players' seen masks
             for st in player_state.values():
                 sm = st.get('seen')
-                if not sm:
+                if sm is None:
                     continue
-                for yy in range(GRID_H):
-                    row_sm = sm[yy]
-                    row_vis = visible_mask[yy]
-                    for xx in range(GRID_W):
-                        if row_sm[xx]:
-                            row_vis[xx] = True
+                np.logical_or(visible_mask, sm, out=visible_mask)
         else:
             # full visibility
-            visible_mask = [[True for _ in range(GRID_W)] for _ in range(GRID_H)]
+            visible_mask = np.ones((GRID_H, GRID_W), dtype=bool)
+        # Tight box around visible cells; lets per-enemy checks reject with integer compares
+        if vis_mode in ('fog', 'reveal'):
+            vis_bounds = _visible_bounds(visible_mask)
+        else:
+            vis_bounds = (0, GRID_W - 1, 0, GRID_H - 1)
 
         # Draw biomes background on empty tiles and walls in white BEFORE players so they are not covered
-        biome_colors = {
-            0: (135, 206, 235),  # sky blue for non-biome
-            1: (255, 179, 186),  # pastel red
-            2: (255, 223, 186),  # pastel orange
-            3: (255, 255, 186),  # pastel yellow
-            4: (186, 255, 201),  # pastel green
-            5: (186, 225, 255),  # pastel blue
-            6: (218, 186, 255),  # pastel purple
-        }
         # Compute viewport in tile coords (zoomed if enabled, otherwise full grid)
         try:
             zoom_enabled = bool(vis_cfg.get('zoom_enabled', True))
@@ -2861,78 +3822,46 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
             return pygame.Rect(x0, y0, w, h)
 
         # Advance simple enemy AI/movement
-        tick_enemies()
-
-        # Fill empty cells within viewport
-        for y in range(vy0, vy1 + 1):
-            for x in range(vx0, vx1 + 1):
-                if grid[y][x] == EMPTY:
-                    r = vcell_rect(x, y)
-                    if not visible_mask[y][x]:
-                        pygame.draw.rect(screen, (8, 8, 8), r)
-                        continue
-                    # Blend colors from all centers within radius using inverse-distance weights
-                    if biome_centers and biome_radius > 0:
-                        wt_sum = 0.0
-                        rad = biome_radius
-                        r2 = rad * rad
-                        cr = cg = cb = 0.0
-                        for (cx0, cy0, bid) in biome_centers:
-                            dx = x - cx0
-                            dy = y - cy0
-                            d2 = dx*dx + dy*dy
-                            if d2 <= r2:
-                                w = 1.0 / (1.0 + math.sqrt(max(0.0, d2)))
-                                base = biome_colors.get(bid, (135, 206, 235))
-                                cr += base[0] * w
-                                cg += base[1] * w
-                                cb += base[2] * w
-                                wt_sum += w
-                        if wt_sum > 0:
-                            col = (int(cr / wt_sum), int(cg / wt_sum), int(cb / wt_sum))
-                        else:
-                            bid = biomes[y][x] if biomes else 0
-                            col = biome_colors.get(bid, (135, 206, 235))
-                    else:
-                        bid = biomes[y][x] if biomes else 0
-                        col = biome_colors.get(bid, (135, 206, 235))
-                    pygame.draw.rect(screen, col, r)
-
-        # Draw walls on top within viewport; use images from wall_types.json when available
+        _enemy_view_moved(tick_enemies())
+
+        # Fill the viewport background in one blit: biome colours per tile with unseen tiles
+        # darkened, expanded to the same tile borders vcell_rect uses. Walls are painted over below.
+        view_rgb = get_biome_color_grid()[vy0:vy1 + 1, vx0:vx1 + 1].copy()
+        view_rgb[~visible_mask[vy0:vy1 + 1, vx0:vx1 + 1]] = 8
+        col_w = np.diff((np.arange(vw + 1) * u_scale).astype(np.intp))
+        row_h = np.diff((np.arange(vh + 1) * u_scale).astype(np.intp))
+        view_px = np.repeat(np.repeat(view_rgb, row_h, axis=0), col_w, axis=1)
+        if view_px.size:
+            screen.blit(pygame.surfarray.make_surface(view_px.swapaxes(0, 1)), (ox, oy))
+
+        # Draw walls on top within viewport; use images from wall_types.json when available.
+        # Unseen walls are already dark from the background pass, so only visible walls are visited.
         wt_map = get_wall_type_map()
-        for y in range(vy0, vy1 + 1):
-            for x in range(vx0, vx1 + 1):
-                if grid[y][x] == WALL:
-                    r = vcell_rect(x, y)
-                    if not visible_mask[y][x]:
-                        pygame.draw.rect(screen, (8, 8, 8), r)
-                        continue
-                    # Resolve wall type and image
-                    wt_id = None
-                    try:
-                        wt_id = wall_type_id[y][x]
-                    except Exception:
-                        wt_id = None
-                    info = (wt_map.get(wt_id) or {}) if wt_id else {}
-                    img_name = info.get('image')
-                    # Fallback image names per type
-                    if not img_name:
-                        if wt_id == 'door1':
-                            img_name = 'door_wood.png'
-                        else:
-                            img_name = 'stonewall.png'
-                    # Fetch scaled tile surface and blit; try fallbacks if missing
-                    surf = _get_tile_image(img_name, r.width, r.height)
-                    if surf is None:
-                        # Try sensible defaults if provided filename missing
-                        fallback_img = 'door_wood.png' if wt_id == 'door1' else 'stonewall.png'
-                        surf = _get_tile_image(fallback_img, r.width, r.height)
-                    if surf is not None:
-                        screen.blit(surf, (r.x, r.y))
-                    else:
-                        # Final fallback colors similar to previous behavior
-                        col = (150, 90, 40) if wt_id == 'door1' else (255, 255, 255)
-                        pygame.draw.rect(screen, col, r)
+        wall_ys, wall_xs = np.nonzero((grid[vy0:vy1 + 1, vx0:vx1 + 1] == WALL)
+                                      & visible_mask[vy0:vy1 + 1, vx0:vx1 + 1])
+        wall_imgs: Dict[str, Tuple[str, str]] = {}
+        wall_draws = []
+        for y, x in zip((wall_ys + vy0).tolist(), (wall_xs + vx0).tolist()):
+            r = vcell_rect(x, y)
+            # Resolve wall type and image (once per type per frame)
+            wt_id = wall_type_id[y][x] if wall_type_id else None
+            names = wall_imgs.get(wt_id)
+            if names is None:
+                info = (wt_map.get(wt_id) or {}) if wt_id else {}
+                fallback_img = 'door_wood.png' if wt_id == 'door1' else 'stonewall.png'
+                names = wall_imgs[wt_id] = (info.get('image') or fallback_img, fallback_img)
+            # Fetch scaled tile surface; try the fallback if the configured file is missing
+            surf = _get_tile_image(names[0], r.width, r.height)
+            if surf is None:
+                surf = _get_tile_image(names[1], r.width, r.height)
+            if surf is not None:
+                wall_draws.append((surf, (r.x, r.y)))
+            else:
+                # Final fallback colors similar to previous behavior
+                col = (150, 90, 40) if wt_id == 'door1' else (255, 255, 255)
+                pygame.draw.rect(screen, col, r)
+        if wall_draws:
+            screen.blits(wall_draws, doreturn=False)
 
         # Enemy pings inside viewport (respect flags)
         try:
@@ -2944,46 +3873,38 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
         if show_enemies:
             # no bodies on server map, keep as no-op
             pass
-        if show_pings and enemies:
-            types = get_enemy_type_map()
-            t = time.time()
-            surf_cache: Dict[Tuple[int,int,int,int,int], pygame.Surface] = {}
-            for e in enemies.values():
-                pos = e.get('pos')
-                if not pos:
-                    continue
-                cx, cy = int(pos[0]), int(pos[1])
-                if not (vx0 <= cx <= vx1 and vy0 <= cy <= vy1):
-                    continue
-                if (not pings_ignore_vis) and (not visible_mask[cy][cx]):
-                    continue
-                info = types.get(str(e.get('type') or '')) or {}
-                col = info.get('pingcolour', [255, 0, 255])
-                is_boss = bool(info.get('boss'))
-                tier = (info.get('tier') or '').lower()
-                scale_b = 2.2 if (is_boss and tier == 'super') else (1.6 if is_boss else 1.0)
-                base_r = 4 + int((math.sin(t * 2.0) + 1.0) * 0.5 * 12)
-                r_px = max(4, int(base_r * scale_b))
-                # Scale by uniform viewport zoom
-                zoom_px = max(1, int(u_scale / max(1.0, float(TILE_SIZE)) * r_px))
-                size = zoom_px * 2 + 4
-                color_a = (int(col[0]), int(col[1]), int(col[2]), 140)
-                cache_key = (color_a[0], color_a[1], color_a[2], color_a[3], zoom_px)
-                surf = surf_cache.get(cache_key)
-                if surf is None:
-                    surf = pygame.Surface((size, size), pygame.SRCALPHA)
-                    pygame.draw.circle(surf, color_a, (zoom_px+2, zoom_px+2), zoom_px, width=2)
-                    surf_cache[cache_key] = surf
+        if pings_ignore_vis:
+            ping_box = (vx0, vx1, vy0, vy1)
+        elif vis_bounds is not None:
+            # viewport intersected with the visible box
+            ping_box = (max(vx0, vis_bounds[0]), min(vx1, vis_bounds[1]),
+                        max(vy0, vis_bounds[2]), min(vy1, vis_bounds[3]))
+        else:
+            ping_box = None
+        if show_pings and enemies and ping_box is not None:
+            phase = _ping_phase(time.time())
+            zoom_k = u_scale / max(1.0, float(TILE_SIZE))
+            ts_half = int(u_scale) // 2
+            ping_draws = []
+            for e, cx, cy in enemies_in_view(ping_box, None if pings_ignore_vis else visible_mask):
+                # Rings are baked per viewport zoom
+                surf, off = _ping_frames(e['ping_key'], e['ping_scale'], zoom_k)[phase]
                 px, py = vcell_to_px(cx, cy)
                 # center over tile rect
-                ts = int(u_scale)
-                screen.blit(surf, (px + ts//2 - (zoom_px+2), py + ts//2 - (zoom_px+2)))
+                ping_draws.append((surf, (px + ts_half - off, py + ts_half - off), None, pygame.BLEND_PREMULTIPLIED))
+            if ping_draws:
+                screen.blits(ping_draws, doreturn=False)
 
         # Create local state for new players, and process their pending command
         list_y = 220
-        # Snapshot enemy occupancy for player collision checks
-        e_occ_for_players = enemy_occupied_cells()
-        for sid, pdata in list(players.items()):
+        # Packed wall/solid/player/enemy bits for player collision checks
+        blk = get_blockers()
+        # Player radar ring pulses in sync for everyone: integer radii 4..20 times the viewport zoom
+        player_ping_r = 4 + int((math.sin(time.time() * 2.0) + 1.0) * 0.5 * 16)
+        player_ping_px = max(2, int(u_scale / max(1.0, float(TILE_SIZE)) * player_ping_r))
+        player_ping_surf = _get_ping_surface((0, 255, 255, 140), player_ping_px)
+        player_ping_off = int(u_scale) // 2 - (player_ping_px + 2)
+        for sid, pdata in frame_players:
             ensure_player(sid)
             cmd = pdata.get('pending')
             if cmd:
@@ -2992,17 +3913,6 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                 ang = player_state[sid].get('angle', math.radians(90))
                 targ = player_state[sid].get('target_angle', ang)
 
-                def angle_to_dir(a: float) -> str:
-                    # Map angle to nearest cardinal for 4x4 white pixels indicator
-                    a = (a + 2*math.pi) % (2*math.pi)
-                    if a < math.pi/4 or a >= 7*math.pi/4:
-                        return 'right'
-                    if a < 3*math.pi/4:
-                        return 'down'
-                    if a < 5*math.pi/4:
-                        return 'left'
-                    return 'up'
-
                 moved = False
                 if cmd in ('left', 'right'):
                     # queue a 90° turn by adjusting target_angle; smooth interp happens each frame
@@ -3042,12 +3952,11 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                     # Bounds and collisions
                     if dx != 0 or dy != 0:
                         if 0 <= nx < GRID_W and 0 <= ny < GRID_H:
-                            if (grid[ny][nx] != WALL
-                                and (nx, ny) not in occupied
-                                and (nx, ny) not in solid_cells
-                                and (nx, ny) not in e_occ_for_players):
-                                occupied.pop((cx, cy), None)
-                                occupied[(nx, ny)] = sid
+                            if blk[ny, nx] == 0:
+                                occupied.pop(cell_key(cx, cy), None)
+                                occupied[cell_key(nx, ny)] = sid
+                                _blk_clear(cx, cy, BLK_PLAYER)
+                                _blk_set(nx, ny, BLK_PLAYER)
                                 player_state[sid]['cell'] = (nx, ny)
                                 player_state[sid]['pos'] = cell_to_px(nx, ny)
                                 moved = True
@@ -3073,15 +3982,6 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                     ang -= 2*math.pi
                 player_state[sid]['angle'] = ang
             # Update facing dir continuously for indicator
-            def angle_to_dir(a: float) -> str:
-                a = (a + 2*math.pi) % (2*math.pi)
-                if a < math.pi/4 or a >= 7*math.pi/4:
-                    return 'right'
-                if a < 3*math.pi/4:
-                    return 'down'
-                if a < 5*math.pi/4:
-                    return 'left'
-                return 'up'
             player_state[sid]['dir'] = angle_to_dir(player_state[sid]['angle'])
 
             # Mirror live state back to server players dict for persistence
@@ -3091,7 +3991,7 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                 if p is not None:
                     p['cell'] = tuple(st.get('cell') or (0, 0))
                     p['angle'] = float(st.get('angle', ang))
-                    if 'seen' in st and st['seen']:
+                    if st.get('seen') is not None:
                         p['seen'] = st['seen']
             except Exception:
                 pass
@@ -3125,7 +4025,7 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                     tx, ty = cx + dx, cy + dy
                     did_hit = False
                     if 0 <= tx < GRID_W and 0 <= ty < GRID_H:
-                        if grid[ty][tx] == WALL:
+                        if grid[ty, tx] == WALL:
                             # Check wall type damage gating
                             allow = True
                             try:
@@ -3148,12 +4048,14 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                                 except Exception:
                                     wt_stats = {}
                                 max_loc = max(1, int((wt_stats.get('durability', 1) or 1)))
-                                if wall_hp[ty][tx] <= 0:
-                                    wall_hp[ty][tx] = max_loc
-                                wall_hp[ty][tx] = max(0, wall_hp[ty][tx] - wall_damage)
-                                if wall_hp[ty][tx] <= 0:
-                                    grid[ty][tx] = EMPTY
-                                    wall_hp[ty][tx] = 0
+                                if wall_hp[ty, tx] <= 0:
+                                    wall_hp[ty, tx] = max_loc
+                                wall_hp[ty, tx] = max(0, int(wall_hp[ty, tx]) - int(wall_damage))
+                                if wall_hp[ty, tx] <= 0:
+                                    grid[ty, tx] = EMPTY
+                                    _blk_clear(tx, ty, BLK_WALL)
+                                    wall_hp[ty, tx] = 0
+                                rc_walls_rev += 1
                                 # tool durability loss: wall returns damage to the specific instance
                                 try:
                                     # Ensure instance has durability field initialized
@@ -3250,9 +4152,9 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                     if did_hit:
                         try:
                             # level based on remaining hp ratio (0..1), inverted to show stronger cracks when low hp
-                            rem = wall_hp[ty][tx] if (0 <= tx < GRID_W and 0 <= ty < GRID_H) else 0
+                            rem = int(wall_hp[ty, tx]) if (0 <= tx < GRID_W and 0 <= ty < GRID_H) else 0
                             try:
-                                bid_hit = int(biomes[ty][tx])
+                                bid_hit = int(biomes[ty, tx])
                             except Exception:
                                 bid_hit = 0
                             max_loc = max(1, int(WALL_HP_BASE + WALL_HP_PER_BIOME * bid_hit))
@@ -3335,19 +4237,9 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                     pygame.draw.rect(screen, white, (pr.x + pr.w - max(1, pr.w//8), pr.y, max(1, pr.w//8), pr.h))
 
             # radar ping overlay at player position
-            try:
-                if vx0 <= pcx <= vx1 and vy0 <= pcy <= vy1:
-                    t = time.time()
-                    base_r = 4 + int((math.sin(t * 2.0) + 1.0) * 0.5 * 16)
-                    zoom_px = max(2, int(min(scale_x, scale_y) / max(1.0, float(TILE_SIZE)) * base_r))
-                    size = zoom_px * 2 + 4
-                    surf = pygame.Surface((size, size), pygame.SRCALPHA)
-                    alpha = 140
-                    pygame.draw.circle(surf, (0, 255, 255, alpha), (zoom_px+2, zoom_px+2), zoom_px, width=2)
-                    ppx, ppy = vcell_to_px(pcx, pcy)
-                    screen.blit(surf, (ppx + int(scale_x)//2 - (zoom_px+2), ppy + int(scale_y)//2 - (zoom_px+2)))
-            except Exception:
-                pass
+            if vx0 <= pcx <= vx1 and vy0 <= pcy <= vy1:
+                ppx, ppy = vcell_to_px(pcx, pcy)
+                screen.blit(player_ping_surf, (ppx + player_ping_off, ppy + player_ping_off))
 
             # sidebar listing (name)
             name = pdata.get('name', 'Player')
@@ -3414,6 +4306,11 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
         # Draw entity markers after biome overlays.
         # Chests render as yellow dots for visibility; pillars render as black dots; others remain green.
         # If visibility.show_chests is true, chests are shown even through fog.
+        # Config toggle: show chests through fog
+        try:
+            show_chests_through_fog = bool((vis_cfg or {}).get('show_chests', True))
+        except Exception:
+            show_chests_through_fog = True
         for ent in world_entities:
             pos = ent.get('pos') or ent.get('position')
             if not pos or len(pos) < 2:
@@ -3425,13 +4322,8 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
             item_id = str(ent.get('item_id') or '')
             is_chest = item_id.startswith('chest_')
             is_pillar = item_id.startswith('pillar_of_knowledge')
-            # Config toggle: show chests through fog
-            try:
-                show_chests_through_fog = bool((vis_cfg or {}).get('show_chests', True))
-            except Exception:
-                show_chests_through_fog = True
             # Visibility gate: allow chests if configured, otherwise require visibility
-            tile_visible = (0 <= iy < GRID_H and 0 <= ix < GRID_W and visible_mask[iy][ix])
+            tile_visible = (0 <= iy < GRID_H and 0 <= ix < GRID_W and visible_mask[iy, ix])
             if not tile_visible and not (is_chest and show_chests_through_fog):
                 continue
             if is_pillar:
@@ -3450,140 +4342,117 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
 
         # Emit simple raycast frames to each player at ~10 FPS
         now = time.time()
-        for sid, pdata in list(players.items()):
+        # Grid snapshots for the DDA loops, taken on first use this frame (after wall damage above)
+        rc_grid = rc_hp = rc_biomes = None
+        # Billboard positions stacked once per frame; each player culls them in one numpy pass
+        item_soa = _item_sprite_sync()
+        # Enemies that have a billboard image, with their cached per-type projection constants
+        enemy_soa = _enemy_view_sync()
+        sprite_rows = []
+        sprite_specs = []
+        for i, etype in enumerate(enemy_soa['types']):
+            spec = enemy_projection(etype)
+            if spec is not None:
+                sprite_rows.append(i)
+                sprite_specs.append(spec)
+        enemy_pos = enemy_soa['pos'][sprite_rows]
+        for sid, pdata in frame_players:
             st = player_state.get(sid)
             if not st:
                 continue
+            # Client reports when its view is hidden (background tab, locked phone)
+            if not pdata.get('rc_active', True):
+                continue
             if now - st.get('last_frame_ts', 0.0) < 0.1:
                 continue
             st['last_frame_ts'] = now
-
             cx, cy = st['cell']
             # player center in cell space
             px = cx + 0.5
             py = cy + 0.5
             angle = st.get('angle', math.radians(90))
 
-            heights = [0] * RC_NUM_RAYS
-            shades = [0] * RC_NUM_RAYS
-            dists = [0.0] * RC_NUM_RAYS
-            # Per-ray material id (e.g., 'door1' or wall type) for client texture selection
-            mats = [""] * RC_NUM_RAYS
-
-            for r in range(RC_NUM_RAYS):
-                # ray angle across FOV
-                ray_ang = angle - RC_FOV / 2 + (r / (RC_NUM_RAYS - 1)) * RC_FOV
-                ray_dir_x = math.cos(ray_ang)
-                ray_dir_y = math.sin(ray_ang)
-
-                map_x = int(px)
-                map_y = int(py)
-
-                delta_dist_x = abs(1.0 / ray_dir_x) if ray_dir_x != 0 else 1e9
-                delta_dist_y = abs(1.0 / ray_dir_y) if ray_dir_y != 0 else 1e9
-
-                if ray_dir_x < 0:
-                    step_x = -1
-                    side_dist_x = (px - map_x) * delta_dist_x
-                else:
-                    step_x = 1
-                    side_dist_x = (map_x + 1.0 - px) * delta_dist_x
-                if ray_dir_y < 0:
-                    step_y = -1
-                    side_dist_y = (py - map_y) * delta_dist_y
-                else:
-                    step_y = 1
-                    side_dist_y = (map_y + 1.0 - py) * delta_dist_y
-
-                hit = 0
-                side = 0  # 0: x side, 1: y side
-                depth = 0.0
-                # DDA loop
-                while hit == 0 and depth < RC_MAX_DIST:
-                    if side_dist_x < side_dist_y:
-                        side_dist_x += delta_dist_x
-                        map_x += step_x
-                        side = 0
-                    else:
-                        side_dist_y += delta_dist_y
-                        map_y += step_y
-                        side = 1
-                    if 0 <= map_x < GRID_W and 0 <= map_y < GRID_H:
-                        if grid[map_y][map_x] == WALL:
-                            hit = 1
-                    else:
-                        hit = 1  # out of bounds treated as wall
-
-                if side == 0:
-                    perp_dist = (side_dist_x - delta_dist_x)
+            # Columns only change when the view or the walls do; reuse the last cast otherwise
+            # (refreshed at least once a second as a safety net)
+            rc_key = (cx, cy, angle, rc_walls_rev)
+            if st.get('rc_key') != rc_key or now - st.get('rc_ts', 0.0) > 1.0:
+                ray_dx, ray_dy = ray_directions(angle, RC_COS_OFF, RC_SIN_OFF)
+                if _raycast_kernel is not None:
+                    # Output dtypes match the packed wire layout (heights <= RC_H, shades 0..255)
+                    heights_a = np.empty(RC_NUM_RAYS, dtype=np.uint16)
+                    shades_a = np.empty(RC_NUM_RAYS, dtype=np.uint8)
+                    dists_a = np.empty(RC_NUM_RAYS, dtype=np.float64)
+                    hit_x = np.empty(RC_NUM_RAYS, dtype=np.int32)
+                    hit_y = np.empty(RC_NUM_RAYS, dtype=np.int32)
+                    _raycast_kernel(px, py, ray_dx, ray_dy, grid, wall_hp, biomes, RC_NUM_RAYS, RC_H, RC_MAX_DIST,
+                                    WALL, WALL_HP_BASE, WALL_HP_PER_BIOME, heights_a, shades_a, dists_a, hit_x, hit_y)
+                    cols = pack_frame_columns(heights_a, shades_a, dists_a)
+                    far_wall = float(dists_a.max())
+                    hit_x = hit_x.tolist()
+                    hit_y = hit_y.tolist()
                 else:
-                    perp_dist = (side_dist_y - delta_dist_y)
-
-                # Protect against zero
-                perp_dist = max(1e-4, perp_dist)
-
-                # Column height proportional to inverse distance; boosted 1.5x
-                col_h = int(1.5 * RC_H / perp_dist)
-                col_h = max(1, min(RC_H, col_h))
-
-                # Distance shading (closer = brighter)
-                s = 1.0 / (1.0 + 0.08 * perp_dist)
-                if side == 1:
-                    s *= 0.85  # darken for y-sides
-                s = max(0.15, min(1.0, s))
-
-                # Additional darkening to simulate cracks based on wall HP
-                if 0 <= map_x < GRID_W and 0 <= map_y < GRID_H and grid[map_y][map_x] == WALL:
-                    # Capture wall material id at hit cell for client texture swap (e.g., 'door1')
-                    try:
-                        mats[r] = str(wall_type_id[map_y][map_x]) if wall_type_id else ""
-                    except Exception:
-                        mats[r] = ""
-                    hp = wall_hp[map_y][map_x]
-                    # compute local max based on biome
-                    try:
-                        bid_loc = int(biomes[map_y][map_x])
-                    except Exception:
-                        bid_loc = 0
-                    max_loc = max(1, int(WALL_HP_BASE + WALL_HP_PER_BIOME * bid_loc))
-                    frac = max(0.0, min(1.0, hp / float(max_loc)))
-                    # Healthy -> 1.0; broken -> 0.6
-                    s *= (0.6 + 0.4 * frac)
-
-                heights[r] = col_h
-                shades[r] = int(255 * s)
-                dists[r] = float(perp_dist)
+                    if rc_grid is None:
+                        rc_grid = grid.tolist()
+                        rc_hp = wall_hp.tolist()
+                        rc_biomes = biomes.tolist()
+                    heights = [0] * RC_NUM_RAYS
+                    shades = [0] * RC_NUM_RAYS
+                    dists = [0.0] * RC_NUM_RAYS
+                    hit_x = [-1] * RC_NUM_RAYS
+                    hit_y = [-1] * RC_NUM_RAYS
+                    _raycast_columns(px, py, ray_dx.tolist(), ray_dy.tolist(), rc_grid, rc_hp, rc_biomes,
+                                     RC_NUM_RAYS, RC_H, RC_MAX_DIST,
+                                     WALL, WALL_HP_BASE, WALL_HP_PER_BIOME, heights, shades, dists, hit_x, hit_y)
+                    cols = pack_frame_columns(heights, shades, dists)
+                    far_wall = max(dists)
+                # Per-ray material (e.g., 'door1' or wall type) for client texture selection:
+                # one byte per column indexing a per-cast palette, 0 = no wall material
+                mat_ids = bytearray(RC_NUM_RAYS)
+                mat_palette = {'': 0}
+                if wall_type_id:
+                    for r in range(RC_NUM_RAYS):
+                        hx = hit_x[r]
+                        if hx >= 0:
+                            mat_ids[r] = mat_palette.setdefault(str(wall_type_id[hit_y[r]][hx]), len(mat_palette))
+                mats = (bytes(mat_ids), list(mat_palette))
+                st['rc_key'] = rc_key
+                st['rc_ts'] = now
+                st['rc_cols'] = cols
+                st['rc_mats'] = mats
+                # The client hides a billboard behind any nearer wall in its column, so nothing beyond
+                # the farthest wall hit can show; pad for the half-float rounding of the sent distances
+                st['rc_reach'] = far_wall * 1.01 + 0.1
+            else:
+                cols = st['rc_cols']
+                mats = st['rc_mats']
+            reach = st['rc_reach']
 
             # Build billboard sprites from world entities (distance-scaled)
-            sprites: List[Dict[str, Any]] = []
-            # Projection helpers
-            def angle_diff(a, b):
-                d = (a - b + math.pi) % (2*math.pi) - math.pi
-                return d
-
-            for ent in world_entities:
-                # For now, only render items on phone; skip enemies/others
-                if (ent.get('type') or 'item') != 'item':
-                    continue
-                pos = ent.get('pos') or ent.get('position')
-                if not pos or len(pos) < 2:
-                    continue
-                ex, ey = float(pos[0]), float(pos[1])
-                dx = ex - px
-                dy = ey - py
-                dist = math.hypot(dx, dy)
-                if dist <= 1e-3:
-                    continue
-                ang_to = math.atan2(dy, dx)
-                rel = angle_diff(ang_to, angle)
-                # Cull outside FOV (+ small margin)
-                if abs(rel) > (RC_FOV/2 + math.radians(10)):
-                    continue
-
-                # Map rel angle to screen column center
-                norm = (rel + RC_FOV/2) / RC_FOV  # 0..1 across FOV
-                ray_x = int(norm * (RC_NUM_RAYS - 1))
-                ray_x = max(0, min(RC_NUM_RAYS - 1, ray_x))
+            # One tuple per sprite in SPRITE_FIELDS order; transposed into columns for the emit
+            # Two lists per player, swapped on send: one is what the client last received (kept for
+            # the delta check), the other is cleared and refilled here, so steady views allocate no list
+            sprites: List[Tuple] = st.get('sprite_buf')
+            if sprites is None:
+                sprites = st['sprite_buf'] = []
+            else:
+                sprites.clear()
+            add_sprite = sprites.append
+            # View direction for the billboard cone tests
+            fwd_x = math.cos(angle)
+            fwd_y = math.sin(angle)
+
+            # For now, only render items on phone; the cull keeps those inside FOV (+ small margin)
+            # and within reach, and crowded worlds only test the buckets around the viewer
+            item_ents = item_soa['ents']
+            cand = billboard_candidates(item_soa, px, py, reach)
+            item_pos = item_soa['pos'] if cand is None else item_soa['pos'][cand]
+            # Screen column centre and base height for every survivor
+            keep, k_dists, k_rays, k_bases = project_billboards(item_pos, px, py, angle, SPRITE_HALF_FOV,
+                                                                RC_FOV, RC_NUM_RAYS, RC_H, reach)
+            if cand is not None:
+                keep = cand[keep]
+            for i, dist, ray_x, base in zip(keep.tolist(), k_dists.tolist(), k_rays.tolist(), k_bases.tolist()):
+                ent = item_ents[i]
 
                 spr = ent.get('sprite', {})
                 base_w = int(spr.get('base_width', 64))
@@ -3591,15 +4460,10 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                 scale = float(spr.get('scale', 1.0))
                 y_off = int(spr.get('y_offset', 0))
 
-                # screen height for sprite
-                base = RC_H / max(1e-3, dist)
                 # Item/enemy sprite height; items rendered 50% smaller globally
                 type_str = (ent.get('type') or 'item')
                 # Distance-based tuning: per-item overrides or global defaults
-                try:
-                    tuning = (game_config.get_game_config() or {}).get('tuning') or {}
-                except Exception:
-                    tuning = {}
+                tuning = tuning_cfg
                 # Resolve per-item render curves via item definition if available
                 item_id = str(ent.get('item_id') or '')
                 itdef = ITEM_DB.get(item_id) or {}
@@ -3613,7 +4477,7 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                 item_scale_mult = 0.5 if type_str == 'item' else 1.0
                 # Apply live scale bias multiplier for items
                 out_h = int(base * (base_h / 64.0) * scale * item_scale_mult * float(scale_mult_curve) * float(item_scale_bias_mult))
-                out_h = max(1, min(3 * RC_H, out_h))
+                out_h = 1 if out_h < 1 else (RC_H3 if out_h > RC_H3 else out_h)
                 aspect = base_w / max(1, base_h)
                 out_w = int(out_h * aspect)
                 center_x = ray_x
@@ -3626,7 +4490,8 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                     # Gentle taper with distance to keep items seated when far
                     # Close (dist~1): ~0.86H - 1px; Far (dist>=12): ~0.86H - 6px
                     floor_y = int((RC_H * 86) // 100)
-                    floor_y -= int(min(6, 0.5 * max(0.0, dist)))
+                    floor_sink = 0.5 * dist  # dist > 0 after the cull
+                    floor_y -= 6 if floor_sink > 6 else int(floor_sink)
                     # Apply live bias from tuning UI (positive lowers the sprite)
                     floor_y += int(item_floor_bias_px)
                     # Place item so its bottom sits on this floor line
@@ -3637,93 +4502,50 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                 if 'sheet' in spr:
                     sheet = spr['sheet']
                     directions = int(spr.get('directions', 8))
-                    states = spr.get('states', {})
                     state = ent.get('state', 'idle')
-                    st_def = states.get(state) or states.get('idle')
-                    if not st_def:
+                    # Resolved state definition is cached on the entity until its state changes
+                    if ent.get('anim_state') != state:
+                        states = spr.get('states', {})
+                        ent['anim_state'] = state
+                        ent['anim_lut'] = anim_frame_lut(states.get(state) or states.get('idle'))
+                    frame_lut = ent['anim_lut']
+                    if not frame_lut:
                         continue
-                    frames = st_def.get('frames', [])
-                    frame_ms = int(st_def.get('frame_ms', 180))
-                    if not frames:
-                        continue
-                    # advance animation
-                    # store per-entity local time
-                    ent['anim_t'] = ent.get('anim_t', 0.0) + (now - st.get('last_frame_ts', now))
-                    total_ms = max(1, frame_ms * len(frames))
-                    t_ms = int((ent['anim_t'] * 1000) % total_ms)
-                    idx = min(len(frames) - 1, t_ms // frame_ms)
-                    fc, fr = frames[idx]
-                    sx = int(fc) * base_w
-                    sy = int(fr) * base_h
-                    sprites.append({
-                        'img': f'enemies/{sheet}', 'sx': sx, 'sy': sy, 'sw': base_w, 'sh': base_h,
-                        'x': x, 'y': y, 'w': out_w, 'h': out_h, 'depth': dist
-                    })
+                    # advance animation by wall time since this entity was last advanced,
+                    # so it runs at the same speed however many players are looking at it
+                    anim_t = ent.get('anim_t', 0.0) + (now - ent.get('anim_ts', now))
+                    ent['anim_t'] = anim_t
+                    ent['anim_ts'] = now
+                    fc, fr = frame_lut[int(anim_t * ANIM_LUT_PER_SEC) % len(frame_lut)]
+                    sx = fc * base_w
+                    sy = fr * base_h
+                    add_sprite((dist, f'enemies/{sheet}', sx, sy, base_w, base_h, x, y, out_w, out_h, ''))
                 else:
                     image = spr.get('image')
                     if not image:
                         continue
-                    sprites.append({
-                        'img': f'{image}', 'sx': 0, 'sy': 0, 'sw': base_w, 'sh': base_h,
-                        'x': x, 'y': y, 'w': out_w, 'h': out_h, 'depth': dist
-                    })
-
-            # Add enemy sprites (PNG) so phones render enemies
-            etypes = get_enemy_type_map()
-            for e in enemies.values():
-                pos = e.get('pos')
-                if not pos or len(pos) < 2:
-                    continue
-                ex, ey = float(pos[0]), float(pos[1])
-                dx = ex - px
-                dy = ey - py
-                dist = math.hypot(dx, dy)
-                if dist <= 1e-3:
-                    continue
-                ang_to = math.atan2(dy, dx)
-                rel = angle_diff(ang_to, angle)
-                if abs(rel) > (RC_FOV/2 + math.radians(10)):
-                    continue
-                norm = (rel + RC_FOV/2) / RC_FOV
-                ray_x = int(norm * (RC_NUM_RAYS - 1))
-                ray_x = max(0, min(RC_NUM_RAYS - 1, ray_x))
-
-                info = etypes.get(str(e.get('type', ''))) or {}
-                image = info.get('image')
-                if not image:
-                    continue
-                # Use the actual PNG intrinsic size so slicing uses the full sprite
-                base_w, base_h = _get_image_natural_size(image)
-                scale = 1.0
-                y_off = 0
-
-                # Distance-based tuning for enemies
-                try:
-                    tuning = (game_config.get_game_config() or {}).get('tuning') or {}
-                except Exception:
-                    tuning = {}
-                rblock = (info.get('render') or {}) if isinstance(info.get('render'), dict) else {}
-                e_scale_curve = rblock.get('scale_curve') or tuning.get('enemy_scale_curve_default') or []
-                e_y_curve = rblock.get('y_bias_curve') or tuning.get('enemy_y_bias_curve_default') or []
-                e_scale_mult = _sample_curve(e_scale_curve, dist, default=1.0)
-                e_y_bias = _sample_curve(e_y_curve, dist, default=0.0)
-
-                base = RC_H / max(1e-3, dist)
-                out_h = int(base * (base_h / 64.0) * scale * float(e_scale_mult))
-                out_h = max(1, min(3 * RC_H, out_h))
-                aspect = base_w / max(1, base_h)
-                out_w = int(out_h * aspect)
-                center_x = ray_x
-                x = center_x - out_w // 2
-                y = (RC_H - out_h) // 2 - y_off - int(e_y_bias)
-
-                sprites.append({
-                    'img': f'items/{image}', 'sx': 0, 'sy': 0, 'sw': base_w, 'sh': base_h,
-                    'x': x, 'y': y, 'w': out_w, 'h': out_h, 'depth': dist
-                })
+                    add_sprite((dist, f'{image}', 0, 0, base_w, base_h, x, y, out_w, out_h, ''))
+
+            # Add enemy sprites (PNG) so phones render enemies; column and base height for all survivors at once
+            keep, k_dists, k_rays, k_bases = project_billboards(enemy_pos, px, py, angle, SPRITE_HALF_FOV,
+                                                                RC_FOV, RC_NUM_RAYS, RC_H, reach)
+            if keep.size:
+                for i, dist, ray_x, base in zip(keep.tolist(), k_dists.tolist(), k_rays.tolist(), k_bases.tolist()):
+                    img, base_w, base_h, aspect, e_scale_curve, e_y_curve = sprite_specs[i]
+                    # Distance-based tuning for enemies
+                    e_scale_mult = _sample_curve(e_scale_curve, dist, default=1.0)
+                    e_y_bias = _sample_curve(e_y_curve, dist, default=0.0)
+
+                    out_h = int(base * (base_h / 64.0) * float(e_scale_mult))
+                    out_h = 1 if out_h < 1 else (RC_H3 if out_h > RC_H3 else out_h)
+                    out_w = int(out_h * aspect)
+                    x = ray_x - out_w // 2
+                    y = (RC_H - out_h) // 2 - int(e_y_bias)
+
+                    add_sprite((dist, img, 0, 0, base_w, base_h, x, y, out_w, out_h, ''))
 
             # Add other players as billboard sprites (use recolored sprite if available)
-            for other_sid, op in list(players.items()):
+            for other_sid, op in frame_players:
                 if other_sid == sid:
                     continue  # don't render the viewing player as a sprite
                 ost = player_state.get(other_sid)
@@ -3737,17 +4559,16 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
                 ey = float(ocy) + 0.5
                 dx = ex - px
                 dy = ey - py
-                dist = math.hypot(dx, dy)
-                if dist <= 1e-3:
-                    continue
-                ang_to = math.atan2(dy, dx)
-                rel = angle_diff(ang_to, angle)
-                # Cull outside FOV (+ small margin)
-                if abs(rel) > (RC_FOV/2 + math.radians(10)):
+                # Cull outside FOV (+ small margin) with the same cone test as cull_billboards
+                d2 = dx * dx + dy * dy
+                dot = dx * fwd_x + dy * fwd_y
+                if d2 <= 1e-6 or d2 > reach * reach or dot <= 0 or dot * dot < SPRITE_COS_LIM2 * d2:
                     continue
-                norm = (rel + RC_FOV/2) / RC_FOV
+                dist = math.sqrt(d2)
+                rel = math.atan2(dy * fwd_x - dx * fwd_y, dot)
+                norm = (rel + RC_HALF_FOV) * RC_INV_FOV
                 ray_x = int(norm * (RC_NUM_RAYS - 1))
-                ray_x = max(0, min(RC_NUM_RAYS - 1, ray_x))
+                ray_x = 0 if ray_x < 0 else (RC_RAYS_M1 if ray_x > RC_RAYS_M1 else ray_x)
 
                 # Resolve sprite path: recolored if available, else base character
                 img_path = None
@@ -3769,40 +4590,47 @@ def run_game(screen: pygame.surface.Surface, qr_surface: pygame.surface.Surface)
 
                 base = RC_H / max(1e-3, dist)
                 out_h = int(base * (base_h / 64.0) * scale)
-                out_h = max(1, min(3 * RC_H, out_h))
+                out_h = 1 if out_h < 1 else (RC_H3 if out_h > RC_H3 else out_h)
                 aspect = base_w / max(1, base_h)
                 out_w = int(out_h * aspect)
                 center_x = ray_x
                 x = center_x - out_w // 2
                 y = (RC_H - out_h) // 2 - y_off
 
-                sprites.append({
-                    'img': img_path, 'sx': 0, 'sy': 0, 'sw': base_w, 'sh': base_h,
-                    'x': x, 'y': y, 'w': out_w, 'h': out_h, 'depth': dist,
-                    'kind': 'player'
-                })
+                add_sprite((dist, img_path, 0, 0, base_w, base_h, x, y, out_w, out_h, 'player'))
 
-            # Determine sky colour for this player based on their biome
+            # Determine sky colour for this player based on their biome; both only change when the
+            # player steps into another cell (or the map is regenerated)
             pcx, pcy = player_state[sid]['cell']
-            cx_i, cy_i = int(pcx), int(pcy)
-            sky_r, sky_g, sky_b = biome_sky_colour_at(cx_i, cy_i)
-            try:
-                bid = int(biomes[cy_i][cx_i])
-            except Exception:
-                bid = 0
-
-            socketio.emit('frame', {
+            sky_key = (int(pcx), int(pcy), id(biomes))
+            if st.get('sky_key') != sky_key:
+                cx_i, cy_i = sky_key[0], sky_key[1]
+                sky_r, sky_g, sky_b = biome_sky_colour_at(cx_i, cy_i)
+                bid = int(biomes[cy_i, cx_i]) if (biomes is not None and 0 <= cy_i < GRID_H and 0 <= cx_i < GRID_W) else 0
+                st['sky_key'] = sky_key
+                st['sky'] = [int(sky_r), int(sky_g), int(sky_b)]
+                st['sky_bid'] = bid
+
+            # Far-to-near for the client's painter pass; a C-level key beats a lambda and
+            # argsort at the ~10 sprites a view holds. reverse=True keeps ties in insertion order.
+            sprites.sort(key=_SPRITE_DEPTH, reverse=True)
+            frame = {
                 'w': RC_W,
                 'h': RC_H,
-                'heights': heights,
-                'shades': shades,
-                'dists': dists,
-                'mat': mats,
-                'sprites': sorted(sprites, key=lambda s: -s['depth']),
-                'sky': [int(sky_r), int(sky_g), int(sky_b)],
-                'biome': int(bid),
+                'sky': st['sky'],
+                'biome': st['sky_bid'],
                 'angle': float(player_state.get(sid, {}).get('angle', angle)),
-            }, to=sid)
+            }
+            # The client keeps the last columns/sprites it received; only resend the parts that changed
+            if st.get('sent_cols') is not cols:
+                frame['cols'] = cols
+                frame['mat'], frame['mat_palette'] = mats
+                st['sent_cols'] = cols
+            if st.get('sent_sprites') != sprites:
+                frame['sprite_cols'], frame['sprite_palette'] = sprite_columns(sprites)
+                st['sprite_buf'] = st.get('sent_sprites')
+                st['sent_sprites'] = sprites
+            socketio.emit('frame', frame, to=sid)
 
         pygame.display.flip()
         clock.tick(30)
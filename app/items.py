@@ -1,5 +1,5 @@
 # AI_Dungeon/app/items.py
-from typing import Dict, List, Literal, Optional, TypedDict, Any
+from typing import Dict, List, Literal, Optional, Tuple, TypedDict, Any
 from .config import get_items
 
 # Slot names
@@ -53,8 +53,28 @@ class ItemType(TypedDict, total=False):
 ITEM_DB: Dict[str, ItemType] = {}
 
 
+# Ids of active items with equip slots (what item_generator places); None = stale
+_SPAWNABLE_ITEM_IDS: Optional[Tuple[str, ...]] = None
+
+
 def register_item(item: ItemType) -> None:
     ITEM_DB[item['id']] = item
+    invalidate_spawnable_items()
+
+
+def invalidate_spawnable_items() -> None:
+    global _SPAWNABLE_ITEM_IDS
+    _SPAWNABLE_ITEM_IDS = None
+
+
+def spawnable_item_ids() -> Tuple[str, ...]:
+    global _SPAWNABLE_ITEM_IDS
+    if _SPAWNABLE_ITEM_IDS is None:
+        _SPAWNABLE_ITEM_IDS = tuple(
+            it_id for it_id, it in ITEM_DB.items()
+            if it and it.get('allowed_slots') and bool(it.get('active', True))
+        )
+    return _SPAWNABLE_ITEM_IDS
 
 
 def get_item(item_id: str) -> Optional[ItemType]:
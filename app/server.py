@@ -4,11 +4,16 @@ import shutil
 import time
 import json
 import base64
+import numpy as np
 from flask import Flask, render_template, request
 from flask_socketio import SocketIO, emit
 from .items import get_item, get_item_icons_map
 import uuid
 from .config import get_game_config
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Resolve directories relative to this file
 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,7 +22,24 @@ static_dir = os.path.join(base_dir, 'static')
 
 app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
 app.config['SECRET_KEY'] = 'secret!'
-socketio = SocketIO(app, cors_allowed_origins='*')
+
+
+class OrjsonPackets:
+    """json-module stand-in for Socket.IO packets: orjson encodes frames in C (numpy included)."""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    socketio = SocketIO(app, cors_allowed_origins='*', json=OrjsonPackets)
+else:
+    socketio = SocketIO(app, cors_allowed_origins='*')
 
 # Minimal player registry used by the pygame loop
 players = {}
@@ -227,6 +249,7 @@ def on_disconnect():
         # persist profile by IP so the player can resume
         client_ip = request.remote_addr or 'unknown'
         p = players[sid]
+        seen = p.get('seen')
         ip_profiles[client_ip] = {
             'name': p.get('name'),
             'stats': p.get('stats', {}),
@@ -237,8 +260,9 @@ def on_disconnect():
             'backpack_weight_used': p.get('backpack_weight_used', 0.0),
             'cell': p.get('cell'),  # populated by game loop each frame
             'angle': p.get('angle'),
-            # Persist per-player fog-of-war mask if present
-            'seen': p.get('seen'),
+            # Persist per-player fog-of-war mask if present, packed to 1 bit per cell
+            'seen': np.packbits(np.asarray(seen, dtype=bool), axis=None).tobytes() if seen is not None else None,
+            'seen_shape': tuple(np.shape(seen)) if seen is not None else None,
             'character': p.get('character') or None,
             'colors': p.get('colors') or None,
             'sprite_path': p.get('sprite_path') or None,
@@ -312,6 +336,7 @@ def on_join(data):
           'cell': persisted.get('cell'),
           'angle': persisted.get('angle'),
           'seen': persisted.get('seen'),
+          'seen_shape': persisted.get('seen_shape'),
         }
     }
     # If client provided a recolored sprite, save it per IP under static/img/recolored/<ip>.png
@@ -431,6 +456,14 @@ def on_control(data):
     # Movement is smooth: process immediately, no cooldown gating
     _process_control(sid, cmd)
 
+@socketio.on('view')
+def on_view(data):
+    # data: {'active': bool}; hidden clients get no raycast frames until they report back
+    sid = request.sid
+    if sid not in players:
+        return
+    players[sid]['rc_active'] = bool((data or {}).get('active', True))
+
 @socketio.on('action')
 def on_action(data):
     # data: {'button': 'left'|'right'|'inventory'}
@@ -551,6 +551,11 @@
     });
   }
 
+  // Tell the server when this view is hidden so it can stop raycasting frames for us
+  document.addEventListener('visibilitychange', () => {
+    socket.emit('view', { active: !document.hidden });
+  });
+
   // When the server confirms join, refresh the inventory portrait to the saved recolored sprite
   socket.on('joined', () => {
     const portrait = document.getElementById('openInventory');
@@ -840,21 +845,74 @@
   const wallImg = getImage('tiles/stonewall.png');
   // Door texture (wood)
   const doorImg = getImage('tiles/door_wood.png');
+  // Decode an IEEE half float (server packs column dists as float16)
+  function halfToFloat(bits){
+    const exp = (bits >> 10) & 0x1f, frac = bits & 0x3ff;
+    const sign = (bits & 0x8000) ? -1 : 1;
+    if (exp === 0) return sign * frac * Math.pow(2, -24);
+    if (exp === 31) return frac ? NaN : sign * Infinity;
+    return sign * (1 + frac / 1024) * Math.pow(2, exp - 15);
+  }
+  // Socket.IO hands binary fields over as ArrayBuffer (browser) or a typed view; normalise to bytes
+  function toBytes(buf){
+    return (buf instanceof ArrayBuffer) ? new Uint8Array(buf) : new Uint8Array(buf.buffer, buf.byteOffset, buf.byteLength);
+  }
+  // Unpack the binary 'cols' blob: w x uint16 heights, w x uint8 shades, w x float16 dists (little-endian)
+  function decodeFrameCols(buf, w){
+    const bytes = toBytes(buf);
+    const dv = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const heights = new Uint16Array(w), shades = new Uint8Array(w), dists = new Float32Array(w);
+    if (bytes.byteLength < w * 5) return { heights, shades, dists };
+    for (let x = 0; x < w; x++){
+      heights[x] = dv.getUint16(x * 2, true);
+      shades[x] = bytes[w * 2 + x];
+      dists[x] = halfToFloat(dv.getUint16(w * 3 + x * 2, true));
+    }
+    return { heights, shades, dists };
+  }
+  // Unpack a little-endian float16 blob (per-sprite depth) into floats
+  function decodeHalfs(buf){
+    const bytes = toBytes(buf);
+    const dv = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const out = new Float32Array(bytes.byteLength >> 1);
+    for (let i = 0; i < out.length; i++) out[i] = halfToFloat(dv.getUint16(i * 2, true));
+    return out;
+  }
+  // Server omits cols/mat and sprite_cols/sprite_palette when unchanged since the last frame; reuse ours
+  let _lastCols = null, _lastMats = null, _lastDoorMat = -1, _lastSpriteCols = {}, _lastSpritePalette = [];
   socket.on('frame', (data) => {
     if (!ctx || !data) return;
     const w = data.w|0, h = data.h|0;
-    const heights = data.heights || [];
-    const shades = data.shades || [];
-    const dists = data.dists || [];
-    const mats = data.mat || [];
-    const sprites = data.sprites || [];
+    if (data.cols) {
+      _lastCols = decodeFrameCols(data.cols, w);
+      // mat: one byte per column indexing mat_palette
+      _lastMats = data.mat ? toBytes(data.mat) : null;
+      _lastDoorMat = (data.mat_palette || []).indexOf('door1');
+    }
+    if (data.sprite_cols) {
+      _lastSpriteCols = data.sprite_cols;
+      _lastSpriteCols.depth = decodeHalfs(_lastSpriteCols.depth || new ArrayBuffer(0));
+      _lastSpritePalette = data.sprite_palette || [];
+    }
+    const cols = _lastCols;
+    const heights = cols ? cols.heights : [];
+    const shades = cols ? cols.shades : [];
+    const dists = cols ? cols.dists : [];
+    const mats = _lastMats;
+    const doorMat = _lastDoorMat;
+    // Sprites arrive as parallel columns; img/kind are indices into sprite_palette
+    const sc = _lastSpriteCols;
+    const spal = _lastSpritePalette;
+    const nSprites = (sc.depth || []).length;
+    const playerKind = spal.indexOf('player');
     // Occasional debug: how many player sprites arrived and sample path
     try {
       const nowMs = performance.now();
-      if (nowMs - _lastSpriteLogTs > 1000) {
-        const ps = sprites.filter(s => s && s.kind === 'player');
+      if (nowMs - _lastSpriteLogTs > 1000 && playerKind >= 0) {
+        const ps = [];
+        for (let j = 0; j < nSprites; j++) if (sc.kind[j] === playerKind) ps.push(j);
         if (ps.length) {
-          console.debug('[frame] player sprites:', ps.length, 'example img:', ps[0].img);
+          console.debug('[frame] player sprites:', ps.length, 'example img:', spal[sc.img[ps[0]]]);
           _lastSpriteLogTs = nowMs;
         }
       }
@@ -977,7 +1035,7 @@
       const k = 0.35; // slightly lower blend so texture shows more
       const r = mix(shade, tr, k), g = mix(shade, tg, k), b = mix(shade, tb, k);
       // Choose texture by material id (e.g., 'door1' -> door texture)
-      const isDoor = (mats && typeof mats[x] === 'string') ? (mats[x] === 'door1') : false;
+      const isDoor = (mats && doorMat > 0) ? (mats[x] === doorMat) : false;
       const img = isDoor ? doorImg : wallImg;
       const ready = isDoor ? doorReady : wallReady;
       const texW = isDoor ? doorW : wallW;
@@ -1019,17 +1077,18 @@
     }
 
     // Draw sprites (already depth-sorted far->near from server)
-    for (let s of sprites){
-      const img = getImage(s.img);
-      const sx = s.sx|0, sy = s.sy|0, sw = s.sw|0, sh = s.sh|0;
-      const dx0 = s.x|0, dy0 = s.y|0, dw = s.w|0, dh = s.h|0;
+    for (let j = 0; j < nSprites; j++){
+      const img = getImage(spal[sc.img[j]]);
+      const sx = sc.sx[j]|0, sy = sc.sy[j]|0, sw = sc.sw[j]|0, sh = sc.sh[j]|0;
+      const dx0 = sc.x[j]|0, dy0 = sc.y[j]|0, dw = sc.w[j]|0, dh = sc.h[j]|0;
+      const depth = sc.depth[j] || 0;
       if (!dw || !dh) continue;
       // If image not ready yet, draw a temporary placeholder block for visibility
       if (!img || !img.complete || !img.naturalWidth) {
         try {
           ctx.save();
           ctx.globalAlpha = 0.65;
-          ctx.fillStyle = s.kind === 'player' ? '#ff00aa' : '#888';
+          ctx.fillStyle = sc.kind[j] === playerKind ? '#ff00aa' : '#888';
           ctx.fillRect(dx0, dy0, dw, dh);
           ctx.strokeStyle = '#000';
           ctx.lineWidth = 1;
@@ -1043,9 +1102,9 @@
         const x = dx0 + i;
         if (x < 0 || x >= w) continue;
         // occluded by wall closer than sprite depth?
-        if (Array.isArray(dists) && dists.length === w){
+        if (dists && dists.length === w){
           const wall = dists[x] || 1e9;
-          if (wall < (s.depth || 0)) continue;
+          if (wall < depth) continue;
         }
         const srcX = sx + Math.floor((i / dw) * sw);
         try {